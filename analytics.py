@@ -0,0 +1,1491 @@
+"""Headless analytics behind the LinkedIn jobs dashboard.
+
+Loading, enrichment, filtering and the aggregations each dashboard section reads, as plain
+functions over pandas DataFrames. Nothing here imports Streamlit or plotting libraries, so batch
+jobs and tests can compute the dashboard's numbers without a server.
+"""
+import functools
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+
+# Job category rules in priority order: a title gets the first category with a matching term
+JOB_CATEGORY_RULES = (
+    ('Data Scientist', ('data scientist', 'data science')),
+    ('ML/AI Engineer', ('machine learning', 'ml engineer', 'ai engineer',
+                        'ai architect', 'ml scientist', 'applied scientist')),
+    ('Data Engineer', ('data engineer', 'data infrastructure', 'data platform')),
+    ('Data Analyst', ('data analyst', 'business analyst', 'analytics')),
+    ('Research Scientist', ('research scientist', 'researcher')),
+    ('Product/Decision Scientist', ('product scientist', 'decision scientist')),
+    ('Statistician', ('statistician', 'biostatistician')),
+    ('Manager/Lead', ('manager', 'director', 'head of', 'vp', 'chief')),
+)
+
+# Compile a category rule table into a single matcher
+@functools.lru_cache(maxsize=None)
+def compile_category_rules(rules):
+    """Build one regex whose alternatives are tried in rule order (first match wins)"""
+    branches = [
+        '(?=.*?(?:' + '|'.join(re.escape(term) for term in terms) + '))()'
+        for _, terms in rules
+    ]
+    return re.compile('(?:' + '|'.join(branches) + ')', re.DOTALL)
+
+# Function to categorize job titles
+def categorize_job_title(title, rules=JOB_CATEGORY_RULES, default='Other'):
+    """Categorize job titles into standardized role types"""
+    if pd.isna(title):
+        return default
+    match = compile_category_rules(rules).match(str(title).lower())
+    return rules[match.lastindex - 1][0] if match else default
+
+# Function to categorize a column of job titles
+def classify_job_titles(titles, rules=JOB_CATEGORY_RULES, default='Other'):
+    """Categorize job titles, classifying each distinct title only once"""
+    codes, uniques = pd.factorize(titles)
+    labels = [categorize_job_title(title, rules, default) for title in uniques]
+    labels.append(default)  # missing titles (code -1)
+    
+    categories = sorted([name for name, _ in rules] + [default])
+    job_category = pd.Categorical(labels, categories=categories).take(codes)
+    return pd.Series(job_category, index=titles.index, name='job_category')
+
+# Location formats look like "Company · City, ST (Remote)"; the company prefix and work type are optional
+LOCATION_TYPES = ('Remote', 'Hybrid', 'On-site')
+STATE_PATTERN = re.compile(r', ([A-Z]{2})')
+
+# Function to parse a single location string
+def parse_location(location):
+    """Split a location into (location_type, state, city), the city qualified by its state ("Portland, OR")
+    so same-named cities in different states stay apart
+    """
+    text = str(location)
+    location_type = next((t for t in LOCATION_TYPES if t in text), 'Unknown')
+    
+    match = STATE_PATTERN.search(text)
+    if match is None:
+        return location_type, np.nan, np.nan
+    
+    city = text[:match.start()].split(' · ')[-1].strip()
+    return location_type, match.group(1), f'{city}, {match.group(1)}' if city else np.nan
+
+# Function to parse a column of locations
+def parse_locations(locations):
+    """Parse each distinct location once and broadcast the result back to every row"""
+    codes, uniques = pd.factorize(locations)
+    parsed = [parse_location(location) for location in uniques]
+    parsed.append(('Unknown', np.nan, np.nan))  # missing locations (code -1)
+    
+    parsed_df = pd.DataFrame(parsed, columns=['location_type', 'state', 'city'])
+    parsed_df['location_type'] = pd.Categorical(parsed_df['location_type'],
+                                                categories=sorted(LOCATION_TYPES + ('Unknown',)))
+    parsed_df[['state', 'city']] = parsed_df[['state', 'city']].astype('category')
+    parsed_df = parsed_df.take(codes)
+    parsed_df.index = locations.index
+    return parsed_df
+
+# Declared schema of the source CSV; only these columns are read
+CSV_SCHEMA = {
+    'job_title': pa.dictionary(pa.int32(), pa.string()),
+    'company_name': pa.dictionary(pa.int32(), pa.string()),
+    'location': pa.dictionary(pa.int32(), pa.string()),
+    'salary': pa.float32(),
+    'years_of_experience': pa.float32(),  # written as "5.0" in the export, stored as int8
+}
+NUMERIC_COLUMNS = ['salary', 'years_of_experience']
+DICTIONARY_COLUMNS = ['job_title', 'company_name', 'location']
+
+def read_csv_table(path, column_types, rejected):
+    """Multi-threaded pyarrow parse of a path or an in-memory buffer; rows with the wrong field
+    count go to `rejected` (without line numbers, which a threaded parse doesn't report) and empty
+    fields read as missing
+    """
+    def quarantine(row):
+        rejected.append({'reason': 'wrong number of fields', 'text': row.text})
+        return 'skip'
+    
+    return pacsv.read_csv(
+        pa.BufferReader(path) if isinstance(path, pa.Buffer) else path,
+        read_options=pacsv.ReadOptions(use_threads=True),
+        parse_options=pacsv.ParseOptions(invalid_row_handler=quarantine),
+        convert_options=pacsv.ConvertOptions(column_types=column_types,
+                                             include_columns=list(column_types),
+                                             strings_can_be_null=True),
+    )
+
+# Function to read the jobs CSV with the declared schema
+def read_jobs_csv(path):
+    """Read the jobs CSV (a path or a buffer of CSV text), returning (jobs, rejected rows) instead of
+    failing on bad rows
+    """
+    rejected = []
+    try:
+        df = read_csv_table(path, CSV_SCHEMA, rejected).to_pandas()
+    except pa.ArrowInvalid:
+        # Some value doesn't parse as a number: read numbers as text and coerce them per row
+        rejected.clear()
+        text_types = {**CSV_SCHEMA, **{col: pa.string() for col in NUMERIC_COLUMNS}}
+        df = read_csv_table(path, text_types, rejected).to_pandas()
+        for col in NUMERIC_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+    
+    years = df['years_of_experience']
+    invalid = (df['salary'].isna() | years.isna() | (years % 1 != 0) |
+               (years < 0) | (years > np.iinfo(np.int8).max))
+    if invalid.any():
+        bad_rows = df[invalid]
+        rejected.extend({'reason': 'missing or invalid salary/experience',
+                         'text': ','.join(map(str, row))}
+                        for row in bad_rows.itertuples(index=False))
+        df = df[~invalid].reset_index(drop=True)
+    
+    df['years_of_experience'] = df['years_of_experience'].astype('int8')
+    
+    # Dictionary order depends on how the parse was split across threads; sort it so codes are stable
+    for col in DICTIONARY_COLUMNS:
+        categories = df[col].cat.remove_unused_categories().cat.categories
+        df[col] = df[col].cat.set_categories(sorted(categories))
+    
+    return df, pd.DataFrame(rejected, columns=['reason', 'text'])
+
+# Derived-column bins
+EXPERIENCE_BINS = [-1, 2, 5, 10, 50]
+EXPERIENCE_LABELS = ['Entry (0-2)', 'Mid (3-5)', 'Senior (6-10)', 'Expert (10+)']
+SALARY_BINS = [0, 100000, 150000, 200000, 250000, 1000000]
+SALARY_LABELS = ['<$100k', '$100k-$150k', '$150k-$200k', '$200k-$250k', '>$250k']
+
+# Function to add the derived analysis columns
+def enrich_data(df):
+    """Add experience_level, salary_range, location and job_category columns"""
+    df['experience_level'] = pd.cut(df['years_of_experience'], 
+                                     bins=EXPERIENCE_BINS,
+                                     labels=EXPERIENCE_LABELS)
+    
+    df['salary_range'] = pd.cut(df['salary'], 
+                                 bins=SALARY_BINS,
+                                 labels=SALARY_LABELS)
+    
+    # Parse location type, state and city once per distinct location
+    df[['location_type', 'state', 'city']] = parse_locations(df['location'])
+    
+    # Categorize job roles
+    df['job_category'] = classify_job_titles(df['job_title'])
+    
+    return df
+
+# On-disk cache of the enriched dataset, reused across server restarts
+DATA_PATH = 'data/linkedin_jobs.csv'
+CACHE_DIR = 'data/.cache'
+# Bump when enrich_data() changes in a way the rule tables below don't capture
+ENRICHMENT_VERSION = 4
+
+def enrichment_key():
+    """Hash of the enrichment code version and rule tables"""
+    rules = (ENRICHMENT_VERSION, CSV_SCHEMA, EXPERIENCE_BINS, EXPERIENCE_LABELS,
+             SALARY_BINS, SALARY_LABELS, LOCATION_TYPES, STATE_PATTERN.pattern, JOB_CATEGORY_RULES)
+    return hashlib.blake2b(repr(rules).encode(), digest_size=16).hexdigest()
+
+def file_hash(path, start=0, end=None):
+    """Content hash of bytes [start, end) of a file (to its end when None), read in 1 MB chunks"""
+    digest = hashlib.blake2b(digest_size=16)
+    remaining = float('inf') if end is None else end - start
+    with open(path, 'rb') as f:
+        f.seek(start)
+        for chunk in iter(lambda: f.read(int(min(1 << 20, remaining))), b''):
+            digest.update(chunk)
+            remaining -= len(chunk)
+    return digest.hexdigest()
+
+# Bytes just before the end of what was read that are hashed again to tell an append from a rewrite
+TAIL_CHECK_BYTES = 1 << 16
+
+def extend_fingerprint(fingerprint, path, size):
+    """Fingerprint of the first `size` bytes of `path`: one hash per span read so far, so extending
+    `fingerprint` (of a shorter prefix, or None) only hashes the bytes after it, plus a hash of
+    the last TAIL_CHECK_BYTES for only_appended()
+    """
+    spans = [] if fingerprint is None else fingerprint['spans']
+    start = spans[-1][0] if spans else 0
+    if size > start:
+        spans = spans + [[size, file_hash(path, start, size)]]
+    return {'size': size, 'spans': spans, 'tail': file_hash(path, max(0, size - TAIL_CHECK_BYTES), size)}
+
+def matches_fingerprint(path, fingerprint):
+    """True if `path` is exactly the bytes `fingerprint` covers, every span hashed again"""
+    if os.path.getsize(path) != fingerprint['size']:
+        return False
+    start = 0
+    for end, digest in fingerprint['spans']:
+        if file_hash(path, start, end) != digest:
+            return False
+        start = end
+    return True
+
+def only_appended(path, fingerprint):
+    """True if `path` still holds the prefix `fingerprint` covers, with lines added after it.
+    
+    Only the size and the prefix's last TAIL_CHECK_BYTES are checked, so the cost doesn't grow with
+    the file: a rewrite that adds, drops or reorders lines shifts those bytes, but an edit further
+    back that keeps every line's length isn't noticed.
+    """
+    size = fingerprint['size']
+    return (os.path.getsize(path) >= size and
+            file_hash(path, max(0, size - TAIL_CHECK_BYTES), size) == fingerprint['tail'])
+
+# Function to read a CSV's complete lines in blocks
+def csv_blocks(path, start=0, block_bytes=None):
+    """Yield (CSV text, end offset) for the complete lines of `path` after byte `start`, about
+    `block_bytes` at a time (all at once when None). Every block starts with the header line; a
+    last line without its newline yet is left for the next read.
+    """
+    with open(path, 'rb') as f:
+        header = f.readline()
+        f.seek(max(start, len(header)))
+        offset = f.tell()
+        pending = b''
+        for data in iter(lambda: f.read(block_bytes or -1), b''):
+            data = pending + data
+            cut = data.rfind(b'\n') + 1
+            pending = data[cut:]
+            if cut:
+                offset += cut
+                yield pa.py_buffer(header + data[:cut]), offset
+
+def cache_paths(path):
+    """Arrow and manifest paths for a source CSV"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return (os.path.join(CACHE_DIR, f'{name}.arrow'),
+            os.path.join(CACHE_DIR, f'{name}.json'))
+
+# The cache's manifest (the source's fingerprint, the enrichment rules and the frame's attrs) is
+# stored in the Arrow file's schema metadata under this key, so data and fingerprint are replaced
+# together. The JSON file beside it only records the source's mtime once a later read has checked
+# it against the fingerprint
+CACHE_METADATA_KEY = b'jobs_cache'
+
+def read_cache_file(path):
+    """(manifest, table) of the cache for a source CSV, both from one memory map of its Arrow file,
+    or None if there is none for the current rules. The table's columns are read-only views of the
+    mapped file.
+    """
+    arrow_path, manifest_path = cache_paths(path)
+    try:
+        table = pa.ipc.open_file(pa.memory_map(arrow_path)).read_all()
+        manifest = json.loads(table.schema.metadata[CACHE_METADATA_KEY])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if manifest.get('enrichment') != enrichment_key():
+        return None
+    
+    try:
+        with open(manifest_path) as f:
+            checked = json.load(f)
+    except (OSError, ValueError):
+        checked = {}
+    if checked.get('source') == manifest['source']:
+        manifest['mtime_ns'] = checked['mtime_ns']
+    return manifest, table
+
+def cached_frame(manifest, table):
+    """The cached jobs as a frame of the mapped columns, with their attrs"""
+    df = table.to_pandas(split_blocks=True)
+    df.attrs.update(manifest.get('attrs', {}))
+    return df
+
+def cache_is_current(path, manifest):
+    """True if the cache covers all of the source as it is now. Size and mtime are a fast path;
+    if they moved, every byte is checked against the fingerprint and the new mtime remembered.
+    """
+    stat = os.stat(path)
+    if (manifest['source']['size'], manifest.get('mtime_ns')) == (stat.st_size, stat.st_mtime_ns):
+        return True
+    if not matches_fingerprint(path, manifest['source']):
+        return False
+    write_manifest(cache_paths(path)[1], {'source': manifest['source'], 'mtime_ns': stat.st_mtime_ns})
+    return True
+
+def read_enriched_cache(path):
+    """Return the cached enriched frame, memory-mapped, or None if the source or the rules changed"""
+    cached = read_cache_file(path)
+    if cached is None or not cache_is_current(path, cached[0]):
+        return None
+    return cached_frame(*cached)
+
+# Function to replace a cache file atomically
+def replace_cache_file(target, write):
+    """Call `write(tmp_path)` for a fresh temporary file beside `target`, then move it over `target`,
+    so readers see the old file or the new one and concurrent writers never share a temporary file
+    """
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=os.path.basename(target) + '.',
+                                    suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, target)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def write_manifest(manifest_path, manifest):
+    """Atomically replace the cache manifest; failures only skip it"""
+    def write(tmp_path):
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f)
+    try:
+        replace_cache_file(manifest_path, write)
+    except OSError:
+        pass
+
+def write_cache_table(path, table, source, attrs):
+    """Write a table of enriched jobs with `source`, the fingerprint of the bytes of `path` it
+    covers, and the frame's `attrs`; failures only skip caching.
+    
+    The table is stored as an uncompressed Arrow file so readers can map it instead of decoding it.
+    """
+    manifest = {
+        'source': source,
+        'mtime_ns': os.stat(path).st_mtime_ns,
+        'enrichment': enrichment_key(),
+        'attrs': attrs,
+    }
+    table = table.replace_schema_metadata({**table.schema.metadata, CACHE_METADATA_KEY: json.dumps(manifest)})
+    
+    def write(tmp_path):
+        with pa.OSFile(tmp_path, 'wb') as f, pa.ipc.new_file(f, table.schema) as writer:
+            writer.write_table(table)
+    try:
+        replace_cache_file(cache_paths(path)[0], write)
+    except OSError:
+        pass
+
+def write_enriched_cache(path, df, source=None):
+    """Write the enriched frame and its source fingerprint; failures only skip caching. `source`
+    fingerprints the bytes of `path` the frame covers (all of them when None).
+    """
+    if source is None:
+        source = extend_fingerprint(None, path, os.path.getsize(path))
+    write_cache_table(path, pa.Table.from_pandas(df, preserve_index=False), source, df.attrs)
+
+def rejected_rows_path(path):
+    """Quarantine file for rows of a source CSV that failed the schema"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(CACHE_DIR, f'{name}.rejected.csv')
+
+def write_rejected_rows(path, rejected, append=False):
+    """Write (or append) quarantined rows next to the cache for inspection"""
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        rejected.to_csv(rejected_rows_path(path), index=False, mode='a' if append else 'w', header=not append)
+    except OSError:
+        pass
+
+# Function to load the enriched jobs dataset
+def load_jobs(path=DATA_PATH):
+    """The enriched jobs in `path`, mapped read-only from the on-disk cache when it is current and
+    otherwise parsed, enriched and cached; `attrs['rejected_rows']` counts the rows skipped
+    """
+    return refresh_jobs(path)[0]
+
+# Function to bring the enriched jobs up to date with their CSV
+def refresh_jobs(path=DATA_PATH):
+    """(jobs, appended): the enriched jobs as load_jobs returns them, and the enriched rows this call
+    added to the cache. If the CSV was only appended to since it was cached, just the new lines are
+    parsed and enriched (`appended` is empty when there were none); if it was rewritten, or the
+    cache is missing or for other rules, it is rebuilt and `appended` is None.
+    """
+    cached = read_cache_file(path)
+    if cached is not None:
+        manifest, table = cached
+        if cache_is_current(path, manifest):
+            df = cached_frame(manifest, table)
+            return df, df.iloc[:0]
+        if only_appended(path, manifest['source']):
+            return append_to_cache(path, manifest, table)
+    
+    df, rejected = read_jobs_csv(path)
+    df = enrich_data(df)
+    df.attrs['rejected_rows'] = len(rejected)
+    if len(rejected) > 0:
+        write_rejected_rows(path, rejected)
+    write_enriched_cache(path, df)
+    
+    # Serve the mapped file so the parsed frame is freed; keep it if the cache couldn't be written
+    mapped = read_enriched_cache(path)
+    return (df if mapped is None else mapped), None
+
+# Function to add the lines appended to a CSV to its cached jobs
+def append_to_cache(path, manifest, table):
+    """(jobs, appended): the cached jobs in `table`, for the bytes of `path` its `manifest`
+    fingerprints, with the complete lines after them parsed, enriched and appended, and the cache
+    rewritten to cover them. Only the new bytes are hashed, and the cached rows stay in Arrow.
+    """
+    blocks = list(csv_blocks(path, manifest['source']['size']))
+    if not blocks:
+        df = cached_frame(manifest, table)
+        return df, df.iloc[:0]
+    buffer, end = blocks[0]
+    
+    appended, rejected = read_jobs_csv(buffer)
+    appended = enrich_data(appended)
+    attrs = dict(manifest.get('attrs', {}))
+    rejected_rows = attrs.get('rejected_rows', 0)
+    attrs['rejected_rows'] = rejected_rows + len(rejected)
+    if len(rejected) > 0:
+        write_rejected_rows(path, rejected, append=rejected_rows > 0)
+    source = extend_fingerprint(manifest['source'], path, end)
+    jobs = append_table(table, pa.Table.from_pandas(appended, preserve_index=False))
+    write_cache_table(path, jobs, source, attrs)
+    
+    # Serve the mapped file, unless the write failed or another session has replaced it since
+    mapped = read_cache_file(path)
+    if mapped is None or mapped[0]['source'] != source:
+        mapped = {'attrs': attrs}, jobs
+    return cached_frame(*mapped), appended
+
+# Function to append enriched rows to a cached table
+def append_table(table, appended):
+    """`table` followed by `appended`, each dictionary column over the union of both dictionaries
+    (sorted, as a full parse leaves them, unless the column is ordered) with the smallest index
+    type that holds it, as pandas would pick for the codes. Chunks whose dictionary is already the
+    union are reused as they are.
+    """
+    columns = {}
+    for field in table.schema:
+        chunks = table[field.name].chunks + appended[field.name].chunks
+        if not pa.types.is_dictionary(field.type):
+            columns[field.name] = pa.chunked_array(chunks, field.type)
+            continue
+        
+        # An appended column with no categories comes back from pandas with a double dictionary
+        dictionaries = [chunk.dictionary.cast(field.type.value_type) for chunk in chunks]
+        values = pc.unique(pa.concat_arrays(dictionaries))
+        if not field.type.ordered:
+            values = values.take(pc.sort_indices(values))
+        index_type = next(t for t in (pa.int8(), pa.int16(), pa.int32())
+                          if len(values) < np.iinfo(t.to_pandas_dtype()).max)
+        columns[field.name] = pa.chunked_array([
+            pa.DictionaryArray.from_arrays(
+                (chunk.indices if dictionary.equals(values) else
+                 pc.take(pc.index_in(dictionary, value_set=values), chunk.indices)).cast(index_type),
+                values, ordered=field.type.ordered)
+            for chunk, dictionary in zip(chunks, dictionaries)
+        ], pa.dictionary(index_type, field.type.value_type, field.type.ordered))
+    return pa.table(columns).replace_schema_metadata(table.schema.metadata)
+
+# Function to compare column memory against plain object strings / float64
+def column_memory_report(df):
+    """Bytes per column as loaded vs. the untyped pandas representation"""
+    rows = []
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            untyped = series.astype(object)
+        elif pd.api.types.is_numeric_dtype(series):
+            untyped = series.astype('float64')
+        else:
+            untyped = series
+        rows.append({
+            'Column': col,
+            'Dtype': str(series.dtype),
+            'Bytes Before': untyped.memory_usage(index=False, deep=True),
+            'Bytes After': series.memory_usage(index=False, deep=True),
+        })
+    
+    report = pd.DataFrame(rows)
+    total = {'Column': 'Total', 'Dtype': '',
+             'Bytes Before': report['Bytes Before'].sum(), 'Bytes After': report['Bytes After'].sum()}
+    return pd.concat([report, pd.DataFrame([total])], ignore_index=True)
+
+# Function to drop empty categories before plotting
+def drop_unused_categories(df, columns):
+    """plotly express fails to group on categories with no rows, so drop them from `columns`"""
+    return df.assign(**{
+        col: df[col].cat.remove_unused_categories()
+        for col in columns if isinstance(df[col].dtype, pd.CategoricalDtype)
+    })
+
+# Sidebar filter columns: sliders filter by range, selectboxes by exact category
+FILTER_RANGE_COLUMNS = ['years_of_experience', 'salary']
+FILTER_CATEGORY_COLUMNS = ['location_type', 'city', 'company_name', 'job_category']
+
+# Function to build the sidebar filter index
+def build_filter_index(df):
+    """Presorted row orders for the range filters and per-category row lists for the rest"""
+    row_dtype = np.int32 if len(df) < 2**31 else np.int64
+    index = {'n_rows': len(df), 'ranges': {}, 'categories': {}}
+    
+    for col in FILTER_RANGE_COLUMNS:
+        values = df[col].to_numpy()
+        order = np.argsort(values, kind='stable').astype(row_dtype)
+        index['ranges'][col] = {'values': values, 'sorted': values[order], 'order': order}
+    
+    for col in FILTER_CATEGORY_COLUMNS:
+        codes = df[col].cat.codes.to_numpy()
+        categories = df[col].cat.categories
+        # Rows grouped by code (original order within a code); code k owns order[offsets[k]:offsets[k + 1]]
+        order = np.argsort(codes, kind='stable').astype(row_dtype)
+        offsets = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+        index['categories'][col] = {'codes': codes, 'categories': categories,
+                                    'order': order, 'offsets': offsets}
+    
+    return index
+
+# Function to add appended rows to the sidebar filter index
+def extend_filter_index(index, df):
+    """`index`, built over the first index['n_rows'] rows of `df`, extended to all of them by
+    inserting the new rows into its sorted orders rather than sorting everything again
+    """
+    start = index['n_rows']
+    row_dtype = np.int32 if len(df) < 2**31 else np.int64
+    if any(entry['order'].dtype != row_dtype for entry in index['ranges'].values()):
+        return build_filter_index(df)
+    new_rows = np.arange(start, len(df), dtype=row_dtype)
+    extended = {'n_rows': len(df), 'ranges': {}, 'categories': {}}
+    
+    # New rows go after old rows with equal values, as a stable sort of all rows would put them
+    for col in FILTER_RANGE_COLUMNS:
+        entry = index['ranges'][col]
+        values = df[col].to_numpy()
+        new_order = np.argsort(values[start:], kind='stable')
+        new_sorted = values[start:][new_order]
+        at = np.searchsorted(entry['sorted'], new_sorted, side='right')
+        extended['ranges'][col] = {'values': values, 'sorted': np.insert(entry['sorted'], at, new_sorted),
+                                   'order': np.insert(entry['order'], at, new_rows[new_order])}
+    
+    for col in FILTER_CATEGORY_COLUMNS:
+        entry = index['categories'][col]
+        codes = df[col].cat.codes.to_numpy()
+        categories = df[col].cat.categories
+        # Old runs stay in place if the old categories keep their relative order among the new ones
+        old_codes = categories.get_indexer(entry['categories'])
+        if (old_codes < 0).any() or (np.diff(old_codes) <= 0).any():
+            return build_filter_index(df)
+        # Each new row goes to the end of its code's run (missing values, code -1, come first)
+        ends = np.searchsorted(codes[entry['order']], np.arange(-1, len(categories)), side='right')
+        new_order = np.argsort(codes[start:], kind='stable')
+        order = np.insert(entry['order'], ends[codes[start:][new_order] + 1], new_rows[new_order])
+        offsets = np.searchsorted(codes[order], np.arange(len(categories) + 1))
+        extended['categories'][col] = {'codes': codes, 'categories': categories,
+                                       'order': order, 'offsets': offsets}
+    
+    return extended
+
+# Function to resolve the sidebar filters against the index
+def filter_rows(index, ranges, categories):
+    """Row positions matching every filter in original order, or None if nothing is filtered.
+    
+    `ranges` maps range columns to inclusive (low, high) bounds; `categories` maps
+    category columns to the selected value.
+    """
+    candidates = []  # (size, row ids, check to run on other candidates)
+    
+    for col, (low, high) in ranges.items():
+        entry = index['ranges'][col]
+        start = np.searchsorted(entry['sorted'], low, side='left')
+        stop = np.searchsorted(entry['sorted'], high, side='right')
+        if start == 0 and stop == index['n_rows']:
+            continue  # slider covers the whole column
+        values = entry['values']
+        candidates.append((stop - start, entry['order'][start:stop],
+                           lambda rows, values=values, low=low, high=high:
+                               (values[rows] >= low) & (values[rows] <= high)))
+    
+    for col, value in categories.items():
+        entry = index['categories'][col]
+        if value not in entry['categories']:
+            return np.empty(0, dtype=np.intp)
+        code = entry['categories'].get_loc(value)
+        start, stop = entry['offsets'][code], entry['offsets'][code + 1]
+        codes = entry['codes']
+        candidates.append((stop - start, entry['order'][start:stop],
+                           lambda rows, codes=codes, code=code: codes[rows] == code))
+    
+    if not candidates:
+        return None
+    
+    # Start from the most selective filter and check the others on its rows only
+    candidates.sort(key=lambda candidate: candidate[0])
+    rows = candidates[0][1]
+    for _, _, keep in candidates[1:]:
+        rows = rows[keep(rows)]
+    return np.sort(rows)
+
+# Function to filter a jobs frame
+def filter_jobs(df, ranges, categories, index=None):
+    """Rows of `df` matching the filters (as in filter_rows), looked up in `df`'s filter index when
+    given; without one they are matched with boolean masks, which beats building an index per call
+    """
+    if index is not None:
+        rows = filter_rows(index, ranges, categories)
+        return df if rows is None else df.take(rows)
+    
+    keep = np.ones(len(df), dtype=bool)
+    for col, (low, high) in ranges.items():
+        keep &= df[col].between(low, high).to_numpy()
+    for col, value in categories.items():
+        keep &= (df[col] == value).to_numpy()
+    return df[keep]
+
+# Partial aggregates are sums, counts, mins and maxes, so any set of groups can be merged into a coarser one
+AGGREGATE_MERGE = {
+    'count': 'sum',
+    'salary_sum': 'sum', 'salary_sumsq': 'sum', 'salary_min': 'min', 'salary_max': 'max',
+    'years_sum': 'sum', 'years_sumsq': 'sum', 'years_min': 'min', 'years_max': 'max',
+    'salary_years_sum': 'sum',
+}
+
+# Function to compute mergeable aggregates from rows
+def partial_aggregates(df, dims):
+    """Count, sum, sum of squares, min and max of salary and experience per group of `dims`"""
+    salary = df['salary'].astype('float64')
+    years = df['years_of_experience'].astype('float64')
+    values = pd.DataFrame({
+        'salary': salary, 'salary_sq': salary ** 2,
+        'years': years, 'years_sq': years ** 2,
+        'salary_years': salary * years,
+    })
+    for dim in dims:
+        values[dim] = df[dim]
+    
+    return values.groupby(dims, observed=True, dropna=False).agg(
+        count=('salary', 'size'),
+        salary_sum=('salary', 'sum'), salary_sumsq=('salary_sq', 'sum'),
+        salary_min=('salary', 'min'), salary_max=('salary', 'max'),
+        years_sum=('years', 'sum'), years_sumsq=('years_sq', 'sum'),
+        years_min=('years', 'min'), years_max=('years', 'max'),
+        salary_years_sum=('salary_years', 'sum'),
+    ).reset_index()
+
+# Function to merge partial aggregates into coarser groups
+def rollup(parts, dims, dropna=True):
+    """Merge partial aggregates over `dims` (one total row when empty) and add the means"""
+    if dims:
+        merged = parts.groupby(list(dims), observed=True, dropna=dropna).agg(AGGREGATE_MERGE)
+    else:
+        merged = pd.DataFrame({col: [parts[col].agg(how)] for col, how in AGGREGATE_MERGE.items()})
+    merged['salary_mean'] = merged['salary_sum'] / merged['count']
+    merged['years_mean'] = merged['years_sum'] / merged['count']
+    return merged
+
+# Function to compute quantiles from a table of value counts
+def grouped_quantiles(table, dims, value_col, quantiles):
+    """Quantiles per group of `dims` from (dims, value, count) rows, interpolated like pandas"""
+    keys = dims if dims else [np.zeros(len(table), dtype=np.int8)]
+    merged = table.groupby(keys + [value_col], observed=True)['count'].sum()
+    merged = merged[merged > 0]
+    counts = merged.to_numpy()
+    values = merged.index.get_level_values(-1).to_numpy(dtype='float64')
+    cum = np.cumsum(counts)
+    
+    # Groups are contiguous runs of the sorted index; find the value at each rank with one search
+    group_index = merged.index.droplevel(-1)
+    group_codes = group_index.factorize()[0]
+    starts = np.flatnonzero(np.diff(group_codes, prepend=-1))
+    totals = np.add.reduceat(counts, starts) if len(starts) else counts[:0]
+    base = cum[starts] - counts[starts]
+    
+    result = {}
+    for q in quantiles:
+        rank = q * (totals - 1)
+        low = values[np.searchsorted(cum, base + np.floor(rank), side='right')]
+        high = values[np.searchsorted(cum, base + np.ceil(rank), side='right')]
+        result[q] = low + (rank - np.floor(rank)) * (high - low)
+    
+    result = pd.DataFrame(result, index=group_index[starts])
+    return result if dims else result.reindex([0])
+
+# Sketch error bounds offered in the sidebar, in percent (relative error of every reported quantile)
+QUANTILE_ERROR_OPTIONS = [0.5, 1, 2, 5]
+
+# Function to build mergeable salary quantile sketches per coarse cell
+def build_salary_sketches(df, relative_error):
+    """Log-bucketed salary counts per SKETCH_DIMENSIONS cell (a DDSketch): merging cells is adding
+    counts, and every quantile read from the merged buckets is within `relative_error` of a true
+    salary. A bucket is split where a slider stop cuts through it (a row per salary bin it reaches
+    into), so the filters the cube answers select whole rows.
+    """
+    keys = df[SKETCH_DIMENSIONS].assign(salary_bin=salary_bins(df['salary']),
+                                        bucket=salary_buckets(df['salary'], relative_error))
+    sketches = keys.groupby(CUBE_DIMENSIONS + ['bucket'], observed=True, dropna=False).size().reset_index(name='count')
+    sketches['salary'] = bucket_salaries(sketches['bucket'], relative_error)
+    return sketches
+
+# Function to select the sketch rows of a set of cube cells
+def select_sketches(sketches, cells):
+    """The rows of `sketches` that fall in the cube cells `cells`"""
+    return sketches.merge(cells[CUBE_DIMENSIONS], on=CUBE_DIMENSIONS)
+
+# Function to assign salaries to sketch buckets
+def salary_buckets(salary, relative_error):
+    """Log bucket of each salary: bucket i holds (gamma^(i-1), gamma^i]"""
+    gamma = (1 + relative_error) / (1 - relative_error)
+    salary = salary.to_numpy(dtype='float64')
+    return np.ceil(np.log(np.maximum(salary, 1.0)) / np.log(gamma)).astype(np.int32)
+
+# Function to give sketch buckets a representative salary
+def bucket_salaries(bucket, relative_error):
+    """The salary within `relative_error` of every salary in each bucket"""
+    gamma = (1 + relative_error) / (1 - relative_error)
+    return 2 * gamma ** bucket / (gamma + 1)
+
+# Function to compute per-group quantiles of a measure
+def measure_quantiles(cells, rows, dims, measure, quantiles, sketches=None):
+    """Quantiles of `measure` per group of `dims`: exact from rows, or merged from the cube
+    when `sketches` (the cells' rows of the salary sketches) are given: salary from the sketches,
+    experience from the cells' exact year counts
+    """
+    if sketches is None:
+        if not dims:
+            return rows[measure].quantile(quantiles).to_frame(0).T
+        # Reindexed so a grouping without groups still has a column per level
+        return rows.groupby(dims, observed=True)[measure].quantile(quantiles).unstack().reindex(columns=quantiles)
+    
+    if measure == 'years_of_experience':
+        return grouped_quantiles(cells, dims, measure, quantiles)
+    return grouped_quantiles(sketches, dims, measure, quantiles)
+
+# Function to summarize a measure per group
+def group_stats(rollups, quantiles, dim, measure='salary'):
+    """Count, mean, median, min and max of `measure` per `dim` from planned aggregates"""
+    prefix = 'years' if measure == 'years_of_experience' else measure
+    stats = rollups[(dim,)]
+    return pd.DataFrame({
+        'mean': stats[f'{prefix}_mean'],
+        'median': quantiles[(dim,), measure][0.5].reindex(stats.index),
+        'min': stats[f'{prefix}_min'],
+        'max': stats[f'{prefix}_max'],
+        'count': stats['count'],
+    })
+
+# Geographic analysis (section 5): postings a state needs to be ranked, and how many states are shown
+STATE_MIN_JOBS = 50
+STATE_TOP_N = 20
+# Postings a job category needs to be compared (sections 11 and 12)
+CATEGORY_MIN_JOBS = 10
+
+# Function to rank states by salary
+def top_states(rollups, quantiles, top_n=STATE_TOP_N, min_jobs=STATE_MIN_JOBS):
+    """group_stats of the `top_n` best-paid states (by mean salary) among those with `min_jobs`+ jobs"""
+    stats = group_stats(rollups, quantiles, 'state')
+    return stats[stats['count'] >= min_jobs].sort_values('mean', ascending=False).head(top_n)
+
+# Function to summarize the job categories with enough postings
+def category_stats(rollups, quantiles, measure='salary', min_jobs=CATEGORY_MIN_JOBS):
+    """group_stats of `measure` per job category with at least `min_jobs` jobs"""
+    stats = group_stats(rollups, quantiles, 'job_category', measure)
+    return stats[stats['count'] >= min_jobs]
+
+# Function to summarize salaries per experience level
+def experience_level_stats(rollups, quantiles):
+    """group_stats of salary for every experience level in career order, empty ones with a count of 0"""
+    stats = group_stats(rollups, quantiles, 'experience_level')
+    stats = stats.reindex(pd.Index(EXPERIENCE_LABELS, name='experience_level'))
+    stats['count'] = stats['count'].fillna(0)
+    return stats
+
+# Function to count jobs per experience level
+def experience_level_counts(rollups):
+    """Job count for every experience level in career order, 0 for empty ones"""
+    return rollups[('experience_level',)]['count'].reindex(EXPERIENCE_LABELS, fill_value=0)
+
+# Function to cross job categories with experience levels
+def category_level_salaries(rollups):
+    """Mean salary per job category (rows with any jobs) and experience level (columns in career order)"""
+    salaries = rollups[('job_category', 'experience_level')]['salary_mean'].reset_index()
+    salaries = salaries.pivot(index='job_category', columns='experience_level', values='salary_mean')
+    return salaries.reindex(columns=EXPERIENCE_LABELS).dropna(how='all')
+
+# Function to fit the salary/experience trend line from aggregates
+def salary_trend(totals):
+    """Least-squares slope and intercept of salary on experience, and their correlation"""
+    n = totals['count']
+    sxx = n * totals['years_sumsq'] - totals['years_sum'] ** 2
+    syy = n * totals['salary_sumsq'] - totals['salary_sum'] ** 2
+    sxy = n * totals['salary_years_sum'] - totals['years_sum'] * totals['salary_sum']
+    slope = sxy / sxx
+    intercept = (totals['salary_sum'] - slope * totals['years_sum']) / n
+    return slope, intercept, sxy / np.sqrt(sxx * syy)
+
+# Dimensions the dashboard groups or filters by. Companies and cities have too many values to cross
+# with the rest, so the cube leaves them out (adding salary bins at slider resolution) and their
+# rollups are kept per KEY_ROLLUPS grouping instead
+AGGREGATE_DIMENSIONS = ['years_of_experience', 'experience_level', 'salary_range',
+                        'location_type', 'city', 'state', 'company_name', 'job_category']
+KEY_DIMENSIONS = ['company_name', 'city']
+KEY_ROLLUPS = [('company_name',), ('city',), ('job_category', 'company_name')]
+CUBE_DIMENSIONS = [dim for dim in AGGREGATE_DIMENSIONS if dim not in KEY_DIMENSIONS] + ['salary_bin']
+# Salary sketches are kept per coarser cell, without the salary bins
+SKETCH_DIMENSIONS = CUBE_DIMENSIONS[:-1]
+SALARY_SLIDER_STEP = 10000
+
+# Function to bin salaries at slider resolution
+def salary_bins(salary, origin=None):
+    """Bins alternate between slider stops (even codes) and the open gaps between them (odd
+    codes), so every slider position selects whole bins. Stops start at `origin` (the lowest
+    salary when None).
+    """
+    if origin is None:
+        origin = int(salary.min())
+    offset = (salary.astype('float64') - origin) / SALARY_SLIDER_STEP
+    stop = np.floor(offset)
+    return (2 * stop + (offset != stop)).astype('int32')
+
+# Function to merge partial aggregates of the same groups
+def merge_aggregates(parts, dims, df):
+    """The partial aggregates `parts` combined per group of `dims`, typed as the columns of `df`"""
+    parts = [part.astype({dim: df[dim].dtype for dim in dims if dim in df}) for part in parts]
+    return pd.concat(parts, ignore_index=True).groupby(
+        dims, observed=True, dropna=False).agg(AGGREGATE_MERGE).reset_index()
+
+# Function to build the aggregate cube
+def build_cube(df):
+    """Partial aggregates per distinct combination of the cube dimensions"""
+    return partial_aggregates(df.assign(salary_bin=salary_bins(df['salary'])), CUBE_DIMENSIONS)
+
+# Function to build the rollups over companies and cities
+def build_key_rollups(df):
+    """Partial aggregates per KEY_ROLLUPS grouping, the rollups the cube can't give"""
+    return {dims: partial_aggregates(df, list(dims)) for dims in KEY_ROLLUPS}
+
+# Function to add appended rows to the aggregate cube
+def extend_cube(cube, df, appended):
+    """The cube of `df` from `cube` (built over the rows of `df` before `appended`) merged with the
+    appended rows' cells. Salary bins start at the lowest salary, so the cube is rebuilt instead if
+    the appended rows lower it.
+    """
+    origin = cube['salary_min'].min()
+    if len(appended) == 0:
+        return cube
+    if len(cube) == 0 or appended['salary'].min() < origin:
+        return build_cube(df)
+    
+    new_cells = partial_aggregates(appended.assign(salary_bin=salary_bins(appended['salary'], origin=int(origin))),
+                                   CUBE_DIMENSIONS)
+    return merge_aggregates([cube, new_cells], CUBE_DIMENSIONS, df)
+
+# Function to add appended rows to the key rollups
+def extend_key_rollups(key_rollups, df, appended):
+    """The key rollups of `df` from `key_rollups` (built over the rows of `df` before `appended`)
+    merged with the appended rows' groups
+    """
+    if len(appended) == 0:
+        return key_rollups
+    return {dims: merge_aggregates([groups, partial_aggregates(appended, list(dims))], list(dims), df)
+            for dims, groups in key_rollups.items()}
+
+# Function to select the cube cells matching the sidebar filters
+def select_cube_cells(cells, ranges, categories):
+    """Cells inside every filter, or None if a range bound splits a cell or a filtered column isn't
+    a cube dimension (the cube has no companies or cities), and rows are needed
+    """
+    if any(col not in cells for col in categories):
+        return None
+    keep = np.ones(len(cells), dtype=bool)
+    
+    for col, (low, high) in ranges.items():
+        prefix = 'years' if col == 'years_of_experience' else col
+        cell_min, cell_max = cells[f'{prefix}_min'], cells[f'{prefix}_max']
+        inside = (cell_min >= low) & (cell_max <= high)
+        outside = (cell_max < low) | (cell_min > high)
+        if not (inside | outside).all():
+            return None
+        keep &= inside.to_numpy()
+    
+    for col, value in categories.items():
+        keep &= (cells[col] == value).to_numpy()
+    
+    return cells[keep]
+
+# Function to select the largest values without sorting everything
+def top_k(values, k):
+    """Positions of the k largest values, largest first, ties in original order: O(n + k log k)"""
+    if k <= 0:
+        return np.arange(0)
+    if k < len(values):
+        kth = np.partition(values, len(values) - k)[len(values) - k]
+        above = np.flatnonzero(values > kth)
+        ties = np.flatnonzero(values == kth)[:k - len(above)]
+        candidates = np.concatenate([above, ties])
+    else:
+        candidates = np.arange(len(values))
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+# Companies need this many postings to be ranked by average salary
+COMPANY_MIN_JOBS = 5
+
+# Function to build the company leaderboards
+def company_leaderboards(company_stats, top_n=20, min_jobs=COMPANY_MIN_JOBS):
+    """Top `top_n` companies by job count and by average salary (among those with `min_jobs`+ jobs).
+    
+    `company_stats` is a per-company rollup; both boards are partial selections over it, so
+    top-1000 costs about the same as top-20.
+    """
+    counts = company_stats['count'].to_numpy()
+    mean_salaries = company_stats['salary_mean'].to_numpy()
+    eligible = np.flatnonzero(counts >= min_jobs)
+    
+    boards = []
+    for positions in (top_k(counts, top_n), eligible[top_k(mean_salaries[eligible], top_n)]):
+        board = company_stats.iloc[positions][['count', 'salary_mean']].reset_index()
+        board.columns = ['Company', 'Job Count', 'Avg Salary']
+        boards.append(board)
+    return boards
+
+# Salary percentiles listed in section 4
+PERCENTILES = [10, 25, 50, 75, 90, 95]
+
+# Career trajectory defaults (section 9): years shown, postings needed per point, and percentile band
+TRAJECTORY_YEARS = 15
+TRAJECTORY_MIN_COUNT = 5
+TRAJECTORY_PERCENTILES = [25, 50, 75]
+TRAJECTORY_SPLITS = {'Job Category': 'job_category', 'Location Type': 'location_type'}
+
+# Function to declare the aggregations behind a salary trajectory
+def trajectory_aggregations(split=None, percentiles=TRAJECTORY_PERCENTILES):
+    """Rollup and salary quantiles by years of experience, within each `split` group when given"""
+    dims = (split, 'years_of_experience') if split else ('years_of_experience',)
+    return {'rollups': [dims], 'quantiles': [(dims, 'salary', [p / 100 for p in percentiles])]}
+
+# Function to build the career salary trajectory from planned aggregates
+def salary_trajectory(rollups, quantiles, split=None, max_years=TRAJECTORY_YEARS,
+                      min_count=TRAJECTORY_MIN_COUNT, percentiles=TRAJECTORY_PERCENTILES):
+    """Salary percentiles, mean and count per year of experience (per `split` group when given),
+    for years up to `max_years` with at least `min_count` postings.
+    
+    Every split group comes out of the same grouped rollup and quantile pass.
+    """
+    dims = (split, 'years_of_experience') if split else ('years_of_experience',)
+    stats = rollups[dims]
+    levels = quantiles[dims, 'salary'].reindex(stats.index)
+    
+    trajectory = pd.DataFrame({f'{p}th': levels[p / 100] for p in percentiles})
+    trajectory['mean'] = stats['salary_mean']
+    trajectory['count'] = stats['count']
+    
+    years = stats.index.get_level_values('years_of_experience')
+    keep = (years <= max_years) & (stats['count'] >= min_count).to_numpy()
+    return trajectory[keep].reset_index().rename(columns={'years_of_experience': 'years'})
+
+# Aggregations each section reads: rollups by dimension tuple, and quantiles as (dims, measure, levels)
+SECTION_AGGREGATIONS = {
+    'metrics': {'rollups': [(), ('company_name',)], 'quantiles': [((), 'salary', [0.5])]},
+    1: {'rollups': [(), ('years_of_experience',)]},
+    2: {'rollups': [('experience_level',)], 'quantiles': [(('experience_level',), 'salary', [0.5])]},
+    3: {'rollups': [('company_name',)]},
+    4: {'rollups': [(), ('salary_range',)], 'quantiles': [((), 'salary', [p / 100 for p in PERCENTILES])]},
+    5: {'rollups': [('state',)], 'quantiles': [(('state',), 'salary', [0.5])]},
+    6: {'rollups': [('location_type',)], 'quantiles': [(('location_type',), 'salary', [0.5])]},
+    7: {'quantiles': [(('experience_level',), 'salary', [0.25, 0.5, 0.75])]},
+    8: {'rollups': [('years_of_experience',), ('experience_level',)]},
+    9: trajectory_aggregations(),
+    10: {'rollups': [('job_category',)]},
+    11: {'rollups': [('job_category',)], 'quantiles': [(('job_category',), 'salary', [0.5])]},
+    12: {'rollups': [('job_category',)], 'quantiles': [(('job_category',), 'years_of_experience', [0.5])]},
+    13: {'rollups': [('job_category', 'experience_level')]},
+    14: {'rollups': [('job_category',), ('job_category', 'company_name')],
+         'quantiles': [(('job_category',), 'salary', [0.25, 0.5, 0.75])]},
+}
+
+# Few-valued dimensions are grouped together in one pass, and their rollups are derived from it
+FUSED_DIMENSIONS = ['years_of_experience', 'experience_level', 'salary_range', 'location_type', 'job_category']
+
+# Function to plan the dashboard's aggregations
+def plan_aggregations(declarations):
+    """Deduplicate the declared aggregations and fuse them into as few passes over the cube as possible.
+    
+    Every rollup is derived from the narrowest pass whose dimensions contain its own; quantile
+    requests on the same dimensions are merged so each grouping is read once.
+    """
+    rollup_dims = {dims for spec in declarations.values() for dims in spec.get('rollups', [])}
+    
+    fused = tuple(dim for dim in FUSED_DIMENSIONS
+                  if any(dim in dims and set(dims) <= set(FUSED_DIMENSIONS) for dims in rollup_dims))
+    passes = [fused] if fused else []
+    for dims in sorted(rollup_dims, key=len, reverse=True):
+        if not any(set(dims) <= set(p) for p in passes):
+            passes.append(dims)
+    sources = {dims: min((p for p in passes if set(dims) <= set(p)), key=len) for dims in rollup_dims}
+    
+    quantiles = {}
+    for spec in declarations.values():
+        for dims, measure, levels in spec.get('quantiles', []):
+            quantiles.setdefault(dims, {}).setdefault(measure, set()).update(levels)
+    
+    return {'passes': passes, 'rollups': sources, 'quantiles': quantiles}
+
+# Function to run a planned set of aggregations
+def run_aggregations(plan, cells, rows, sketches=None, key_groups=None):
+    """One grouped pass over the cube cells per planned pass, and one quantile pass per grouping.
+    Rollups over a dimension the cells don't have (the cube's cells have no companies or cities)
+    are merged from `key_groups`, partial aggregates per KEY_ROLLUPS grouping, instead.
+    
+    Returns (rollups keyed by dims, quantiles keyed by (dims, measure)).
+    """
+    keyed = {dims for dims in plan['rollups'] if not set(dims) <= set(cells.columns)}
+    if keyed:
+        passes = [dims for dims in plan['passes'] if set(dims) <= set(cells.columns)]
+        for dims in plan['rollups']:
+            # A rollup whose only pass was over a key dimension gets a pass of its own
+            if dims not in keyed and not any(set(dims) <= set(p) for p in passes):
+                passes.append(dims)
+        plan = dict(plan, passes=passes, rollups={
+            dims: min((p for p in passes if set(dims) <= set(p)), key=len)
+            for dims in plan['rollups'] if dims not in keyed
+        })
+    
+    pass_results = {dims: rollup(cells, dims, dropna=False).reset_index() if dims else cells
+                    for dims in plan['passes']}
+    rollups = {dims: rollup(pass_results[source], dims) for dims, source in plan['rollups'].items()}
+    rollups.update({dims: rollup(key_groups[dims], dims) for dims in keyed})
+    
+    quantiles = {}
+    for dims, measures in plan['quantiles'].items():
+        levels = sorted(set().union(*measures.values()))
+        if sketches is None and dims:
+            # Exact quantiles of every measure from a single grouping of the rows
+            grouped = rows.groupby(list(dims), observed=True)[list(measures)].quantile(levels)
+            for measure in measures:
+                quantiles[dims, measure] = grouped[measure].unstack().reindex(columns=levels)
+        else:
+            for measure in measures:
+                quantiles[dims, measure] = measure_quantiles(cells, rows, list(dims), measure, levels, sketches)
+    
+    return rollups, quantiles
+
+# Function to plan the aggregations for a set of sections
+@functools.lru_cache(maxsize=None)
+def aggregation_plan(sections=None):
+    """Plan for the headline metrics and `sections` (a tuple of section keys; all sections when None)"""
+    if sections is None:
+        return plan_aggregations(SECTION_AGGREGATIONS)
+    return plan_aggregations({key: SECTION_AGGREGATIONS[key] for key in ('metrics',) + sections
+                              if key in SECTION_AGGREGATIONS})
+
+# Function to compute the dashboard's aggregates from rows
+def compute_aggregations(df, sections=None):
+    """Exact (rollups, quantiles) of `df` for the headline metrics and `sections` (all when None)"""
+    plan = aggregation_plan(None if sections is None else tuple(sections))
+    return run_aggregations(plan, partial_aggregates(df, AGGREGATE_DIMENSIONS), df)
+
+# Streaming ingestion: CSV bytes parsed per chunk, raw rows kept for point charts and the
+# salary sketches' error bound
+STREAM_BLOCK_BYTES = 16 * 2 ** 20
+STREAM_SAMPLE_ROWS = 100000
+STREAM_QUANTILE_ERROR = 0.01
+# The streamed key rollups keep only the most frequent keys, in heavy-hitter summaries of at most
+# STREAM_TOP_KEYS keys per KEY_ROLLUPS grouping
+STREAM_TOP_KEYS = 5000
+# Derived columns whose categories keep their bin order; the others are sorted
+ORDERED_CATEGORIES = {'experience_level': EXPERIENCE_LABELS, 'salary_range': SALARY_LABELS}
+
+# Function to read the jobs CSV in bounded chunks
+def stream_jobs(path, start=0, block_bytes=STREAM_BLOCK_BYTES):
+    """Yield (jobs, rejected rows, end offset) for the complete lines of `path` after byte `start`,
+    validated and enriched about `block_bytes` of CSV at a time
+    """
+    for buffer, end in csv_blocks(path, start, block_bytes):
+        df, rejected = read_jobs_csv(buffer)
+        yield enrich_data(df), rejected, end
+
+# Function to turn categorical columns into plain values
+def plain_values(df, columns):
+    """`df` with its categorical `columns` as objects, so frames whose chunks saw different
+    categories concatenate
+    """
+    return df.astype({col: object for col in columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+
+# Function to code a categorical column against a growing vocabulary
+def vocabulary_codes(vocab, values):
+    """Codes of the categorical `values` in `vocab` (-1 when missing), and `vocab` with the values
+    it didn't have appended, so codes from every chunk stay comparable
+    """
+    categories = values.cat.categories
+    vocab = categories if vocab is None else vocab.append(categories.difference(vocab))
+    codes = np.append(vocab.get_indexer(categories), -1)[values.cat.codes]
+    return codes.astype(np.int32), vocab
+
+# Function to fold groups into a table of running aggregates
+def fold_groups(table, groups, how):
+    """Merge `groups` (aggregates indexed by their keys) into `table` in place, with the `how`
+    aggregations: groups already in the table are updated where they are and new ones appended, so
+    a fold costs the size of `groups` rather than of the table. An empty dict starts a table.
+    """
+    if not table:
+        table.update(index=groups.index, **{col: groups[col].to_numpy(copy=True) for col in how})
+        return table
+    
+    positions = table['index'].get_indexer(groups.index)
+    found = positions >= 0
+    merges = {'sum': np.add, 'min': np.fmin, 'max': np.fmax}
+    for col, agg in how.items():
+        values = groups[col].to_numpy()
+        table[col][positions[found]] = merges[agg](table[col][positions[found]], values[found])
+        if not found.all():
+            table[col] = np.concatenate([table[col], values[~found]])
+    if not found.all():
+        table['index'] = table['index'].append(groups.index[~found])
+    return table
+
+# Function to fold a chunk's groups into a heavy-hitter summary
+def fold_heavy_hitters(table, groups, capacity):
+    """Space-saving summary of the keys with the most rows: at most `capacity` keys, each with the
+    aggregates of its rows since it was tracked and 'error', how many earlier rows it may have had.
+    
+    When the summary overflows, the keys with the fewest rows (counted plus error) are dropped;
+    the largest such estimate is the 'floor' charged as error to keys tracked afterwards, so any
+    key with more rows than the floor is always in the summary.
+    """
+    floor = table.get('floor', 0)
+    new = table['index'].get_indexer(groups.index) < 0 if table else np.ones(len(groups), dtype=bool)
+    groups = groups.assign(error=np.where(new, floor, 0))
+    fold_groups(table, groups, dict(AGGREGATE_MERGE, error='sum'))
+    
+    if len(table['index']) > capacity:
+        estimate = table['count'] + table['error']
+        keep = np.zeros(len(estimate), dtype=bool)
+        keep[top_k(estimate, capacity)] = True
+        floor = max(floor, estimate[~keep].max())
+        for col in ['index', 'error'] + list(AGGREGATE_MERGE):
+            table[col] = table[col][keep]
+    table['floor'] = floor
+    return table
+
+# Function to turn a heavy-hitter summary into partial aggregates
+def heavy_hitter_groups(table, dims):
+    """The summary's keys as `dims` columns with their aggregates and error, most rows first"""
+    groups = table['index'].to_frame(index=False)
+    for col in list(AGGREGATE_MERGE) + ['error']:
+        groups[col] = table[col]
+    return groups.sort_values('count', ascending=False, kind='stable', ignore_index=True)
+
+# Function to scale a uniform sample's aggregates up to the rows it was drawn from
+def scale_aggregates(parts, scale):
+    """Partial aggregates of a uniform sample with each sampled row standing for `scale` rows: counts
+    in whole rows that add up to the rounded scaled total, and sums scaled with them so means stay
+    the sample's
+    """
+    counts = parts['count'].to_numpy()
+    estimates = counts * scale
+    scaled = np.floor(estimates)
+    remainder = int(np.rint(estimates.sum()) - scaled.sum())
+    scaled[top_k(estimates - scaled, remainder)] += 1
+    
+    parts = parts.copy()
+    for col, agg in AGGREGATE_MERGE.items():
+        if agg == 'sum' and col != 'count':
+            parts[col] = parts[col] * (scaled / counts)
+    parts['count'] = scaled.astype(counts.dtype)
+    return parts
+
+# Function to estimate how many rows each sampled row stands for
+def sample_scale(sample, total_rows, key_rollups, categories):
+    """`total_rows` over the rows of the uniform `sample`; with a company or city selected that is
+    tracked in the heavy-hitter summaries `key_rollups`, its summarized rows over its sampled ones
+    """
+    for col in KEY_DIMENSIONS:
+        if col not in categories:
+            continue
+        summary = key_rollups[(col,)]
+        counted = summary.loc[summary[col] == categories[col], 'count'].sum()
+        sampled = (sample[col] == categories[col]).sum()
+        if counted and sampled:
+            return max(counted, sampled) / sampled
+    return total_rows / max(len(sample), 1)
+
+# Function to estimate heavy-hitter aggregates from a uniform sample
+def sample_heavy_hitters(sample, total_rows):
+    """Partial aggregates by each KEY_ROLLUPS grouping of the uniform `sample`, scaled up to
+    `total_rows` by scale_aggregates
+    """
+    scale = total_rows / max(len(sample), 1)
+    return {dims: scale_aggregates(partial_aggregates(sample, list(dims)), scale) for dims in KEY_ROLLUPS}
+
+# Function to fold a chunk of jobs into the streaming aggregates
+def fold_jobs(state, df, sample_rows=STREAM_SAMPLE_ROWS, relative_error=STREAM_QUANTILE_ERROR,
+              top_keys=STREAM_TOP_KEYS):
+    """Merge the enriched chunk `df` into `state` (an empty dict to start): cells of the cube
+    with their counts, sums and sums of squares, salary sketches per cell, a heavy-hitter
+    summary of at most `top_keys` keys per KEY_ROLLUPS grouping and a uniform sample of at
+    most `sample_rows` rows. None of them grows with the number of rows or of companies and cities.
+    """
+    first_row = state.get('n_rows', 0)
+    df = df.assign(salary_bin=salary_bins(df['salary'], origin=0))
+    df.index = pd.RangeIndex(first_row, first_row + len(df))
+    
+    # The cube's categorical dimensions are grouped by their code in a vocabulary shared by all chunks
+    vocab = state.setdefault('vocab', {})
+    coded = df[CUBE_DIMENSIONS + ['salary']].copy()
+    for col in CUBE_DIMENSIONS:
+        if isinstance(coded[col].dtype, pd.CategoricalDtype):
+            coded[col], vocab[col] = vocabulary_codes(vocab.get(col), coded[col])
+    
+    # Cube cells and sketches merge by adding counts, so each chunk's groups fold into the totals
+    cells = partial_aggregates(coded, CUBE_DIMENSIONS).set_index(CUBE_DIMENSIONS)
+    sketches = coded[CUBE_DIMENSIONS].assign(bucket=salary_buckets(coded['salary'], relative_error))
+    sketches = sketches.groupby(CUBE_DIMENSIONS + ['bucket']).size().to_frame('count')
+    fold_groups(state.setdefault('cells', {}), cells, AGGREGATE_MERGE)
+    fold_groups(state.setdefault('sketches', {}), sketches, {'count': 'sum'})
+    
+    # Of the companies and cities, only the most frequent are kept
+    heavy_hitters = state.setdefault('heavy_hitters', {})
+    for dims in KEY_ROLLUPS:
+        groups = partial_aggregates(df, list(dims)).dropna(subset=list(dims))
+        groups = plain_values(groups, dims).set_index(list(dims))
+        fold_heavy_hitters(heavy_hitters.setdefault(dims, {}), groups, top_keys)
+    
+    # Bottom-k sample by row hash: a row is kept if its key is among the smallest seen so far
+    keys = sample_keys(df.index)
+    sample = state.get('sample')
+    candidates = np.ones(len(df), dtype=bool)
+    if sample is not None and len(sample) >= sample_rows:
+        candidates = keys < sample['sample_key'].max()
+    rows = df[candidates].drop(columns='salary_bin').assign(sample_key=keys[candidates])
+    sample = pd.concat([sample, plain_values(rows, rows.columns)])
+    if len(sample) > sample_rows:
+        sample = sample.iloc[np.argsort(sample['sample_key'].to_numpy(), kind='stable')[:sample_rows]]
+    
+    state.update(sample=sample, n_rows=first_row + len(df))
+    return state
+
+# Function to restore the dataset's categorical columns
+def restore_categories(df, categories, vocab=None):
+    """`df` with each column in `categories` made categorical over the given values; columns in
+    `vocab` hold codes into it, the others plain values
+    """
+    for col, values in categories.items():
+        if col not in df:
+            continue
+        ordered = col in ORDERED_CATEGORIES
+        if vocab is not None and col in vocab:
+            codes = np.append(pd.Index(values).get_indexer(vocab[col]), -1)[df[col].to_numpy()]
+            df[col] = pd.Categorical.from_codes(codes, categories=values, ordered=ordered)
+        else:
+            df[col] = pd.Categorical(df[col], categories=values, ordered=ordered)
+    return df
+
+# Function to finish the streaming aggregates for the dashboard
+def finish_stream(state, relative_error=STREAM_QUANTILE_ERROR):
+    """The cube, its salary sketches (laid out like build_salary_sketches),
+    the heavy hitters per KEY_ROLLUPS grouping and the sample of rows, with the categorical
+    columns a loaded dataset has
+    """
+    cells = state['cells']['index'].to_frame(index=False)
+    for col in AGGREGATE_MERGE:
+        cells[col] = state['cells'][col]
+    
+    sketches = state['sketches']['index'].to_frame(index=False)
+    sketches['count'] = state['sketches']['count']
+    sketches['salary'] = bucket_salaries(sketches['bucket'], relative_error)
+    
+    vocab = state['vocab']
+    sample = state['sample'].drop(columns='sample_key').sort_index().reset_index(drop=True)
+    categories = {col: ORDERED_CATEGORIES.get(col) or sorted(values) for col, values in vocab.items()}
+    categories.update({col: sorted(sample[col].dropna().unique())
+                       for col in sample.columns if sample[col].dtype == object and col not in categories})
+    
+    return {
+        'cells': restore_categories(cells, categories, vocab),
+        'sketches': restore_categories(sketches, categories, vocab),
+        'heavy_hitters': {dims: heavy_hitter_groups(table, dims) for dims, table in state['heavy_hitters'].items()},
+        'sample': restore_categories(sample, categories),
+        'n_rows': state['n_rows'],
+    }
+
+# Function to aggregate the jobs CSV without loading it
+def stream_aggregates(path=DATA_PATH, state=None, block_bytes=STREAM_BLOCK_BYTES, sample_rows=STREAM_SAMPLE_ROWS,
+                      relative_error=STREAM_QUANTILE_ERROR, top_keys=STREAM_TOP_KEYS):
+    """Streaming counterpart of load_jobs + build_cube + build_salary_sketches: `path` is read a
+    chunk at a time and only the merged aggregates, the heavy hitters and the sample are kept, so
+    memory doesn't grow with the file. Salary bins start at 0 rather than the lowest salary, and rejected rows are
+    appended to the quarantine file chunk by chunk; `sample.attrs` carries the counts.
+    
+    The result's 'state' records how far the file was read. Passing it back folds in only the lines
+    appended since (the file is read from the start again if it was rewritten instead).
+    """
+    if state is None or not only_appended(path, state['source']):
+        state = {'offset': 0, 'source': None, 'rejected_rows': 0}
+    
+    start = state['offset']
+    for df, rejected, end in stream_jobs(path, start, block_bytes):
+        fold_jobs(state, df, sample_rows, relative_error, top_keys)
+        if len(rejected) > 0:
+            write_rejected_rows(path, rejected, append=state['rejected_rows'] > 0)
+            state['rejected_rows'] += len(rejected)
+        state['offset'] = end
+    if state['source'] is None or state['offset'] != start:
+        state['source'] = extend_fingerprint(state['source'], path, state['offset'])
+    
+    stream = finish_stream(state, relative_error)
+    stream['sample'].attrs.update(rejected_rows=state['rejected_rows'], total_rows=stream['n_rows'])
+    stream['state'] = state
+    return stream
+
+# Scatter downsampling: points sent per scatter, rows above which 'Auto' draws a heatmap, heatmap resolution and seed
+SCATTER_MAX_POINTS = 5000
+SCATTER_HEATMAP_ROWS = 100000
+SCATTER_HEATMAP_BINS = 60
+SCATTER_SAMPLE_SEED = 42
+SCATTER_STRATEGIES = ['Auto', 'Stratified sample', 'Density sample', 'Heatmap']
+
+# Function to flag outliers beyond the box-plot whiskers
+def outlier_mask(values, whisker=1.5):
+    """True for values more than `whisker` IQRs outside the quartiles (Tukey fences)"""
+    values = np.asarray(values, dtype='float64')
+    if len(values) == 0:
+        return np.zeros(0, dtype=bool)
+    q1, q3 = np.quantile(values, [0.25, 0.75])
+    return (values < q1 - whisker * (q3 - q1)) | (values > q3 + whisker * (q3 - q1))
+
+# Function to give rows a stable pseudo-random sampling key
+def sample_keys(index, seed=SCATTER_SAMPLE_SEED):
+    """Hash of each row label and the seed, so a row keeps its key across reruns and filter changes"""
+    return pd.util.hash_pandas_object(pd.DataFrame({'row': index, 'seed': seed}), index=False).to_numpy()
+
+# Function to draw a seeded stratified sample
+def stratified_sample(df, n, strata, seed=SCATTER_SAMPLE_SEED):
+    """At most `n` rows, each stratum keeping its share of them; the same rows come back for
+    the same input, so charts don't reshuffle between reruns.
+    
+    Rows left over after rounding go to strata that would otherwise be empty first, then to
+    the largest remainders, so small strata stay visible while the budget holds.
+    """
+    codes = pd.factorize(np.asarray(strata), use_na_sentinel=False)[0]
+    sizes = np.bincount(codes)
+    share = sizes * min(n / len(df), 1.0)
+    quota = np.floor(share)
+    spare = int(min(n, len(df)) - quota.sum())
+    quota[top_k((quota == 0) + (share - quota), spare)] += 1
+    
+    # Rank rows within their stratum by key and keep each stratum's first `quota` rows
+    order = np.lexsort((sample_keys(df.index, seed), codes))
+    starts = np.cumsum(sizes) - sizes
+    rank = np.arange(len(order)) - starts[codes[order]]
+    return df.iloc[np.sort(order[rank < quota[codes[order]]])]
+
+# Function to bin one scatter axis
+def axis_bins(values, bins):
+    """Bin code per value and the label of every bin: categories as they are, numbers in
+    `bins` equal-width bins (whole-number wide for integer columns). Missing values get code -1.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(dtype='int64'), np.asarray(values.cat.categories)
+    
+    numbers = values.to_numpy(dtype='float64')
+    low, high = np.nanmin(numbers), np.nanmax(numbers)
+    if pd.api.types.is_integer_dtype(values.dtype):
+        width = max(1.0, np.ceil((high - low + 1) / bins))
+        low -= 0.5
+    else:
+        width = (high - low) / bins or 1.0
+    codes = np.minimum((numbers - low) // width, bins - 1)
+    count = int(np.nanmax(codes)) + 1
+    return np.where(np.isnan(codes), -1, codes).astype('int64'), low + (np.arange(count) + 0.5) * width
+
+# Function to assign rows to cells of a 2D grid
+def scatter_grid(df, x, y, bins=SCATTER_HEATMAP_BINS):
+    """Grid cell code per row (-1 if either coordinate is missing) and the x and y bin labels"""
+    x_codes, x_labels = axis_bins(df[x], bins)
+    y_codes, y_labels = axis_bins(df[y], bins)
+    cells = np.where((x_codes < 0) | (y_codes < 0), -1, x_codes * len(y_labels) + y_codes)
+    return cells, x_labels, y_labels
+
+# Function to aggregate a scatter into 2D bins
+def binned_scatter(df, x, y, bins=SCATTER_HEATMAP_BINS):
+    """Row count per non-empty grid cell, as (x bin, y bin, count) rows"""
+    cells, x_labels, y_labels = scatter_grid(df, x, y, bins)
+    counts = np.bincount(cells[cells >= 0], minlength=len(x_labels) * len(y_labels))
+    occupied = np.flatnonzero(counts)
+    return pd.DataFrame({
+        x: x_labels[occupied // len(y_labels)],
+        y: y_labels[occupied % len(y_labels)],
+        'count': counts[occupied],
+    })
+
+# Function to choose the rows (or bins) a scatter sends to the browser
+def downsample_scatter(df, x, y, strategy='Auto', stratify_by=None, max_points=SCATTER_MAX_POINTS,
+                       heatmap_rows=SCATTER_HEATMAP_ROWS, seed=SCATTER_SAMPLE_SEED):
+    """Points and heatmap bins for a scatter of `y` against `x`: (points, heatmap, strategy used).
+    
+    Up to `max_points` rows are plotted as they are. Larger inputs are sampled with a fixed seed,
+    either stratified by the `stratify_by` column ('Stratified sample') or by 2D grid cell, which
+    keeps the density of every region and every sparse region ('Density sample'), or binned into
+    a heatmap ('Heatmap', and 'Auto' above `heatmap_rows`). Outliers in `y` are always plotted
+    as points, the most extreme first if they would take more than half the budget.
+    """
+    if len(df) == 0 or (len(df) <= max_points and strategy != 'Heatmap'):
+        return df, None, 'All points'
+    if strategy == 'Auto':
+        strategy = 'Heatmap' if len(df) > heatmap_rows else 'Stratified sample'
+    
+    outliers = outlier_mask(df[y])
+    values = df[y].to_numpy(dtype='float64')
+    outlier_positions = np.flatnonzero(outliers)
+    extremes = top_k(np.abs(values[outlier_positions] - np.median(values)), max_points // 2)
+    outlier_rows = df.iloc[np.sort(outlier_positions[extremes])]
+    inliers = df[~outliers]
+    
+    if strategy == 'Heatmap':
+        return outlier_rows, binned_scatter(inliers, x, y), strategy
+    
+    if strategy == 'Density sample':
+        strata = scatter_grid(inliers, x, y)[0]
+    else:
+        strata = inliers[stratify_by] if stratify_by else np.zeros(len(inliers), dtype=np.int8)
+    sample = stratified_sample(inliers, max_points - len(outlier_rows), strata, seed) if len(inliers) else inliers
+    return pd.concat([sample, outlier_rows]).sort_index(), None, strategy
+
+# Function to bin a histogram on the server
+def histogram_bins(values, bins=50):
+    """Counts over about `bins` equal bins with a round width (1, 2, 2.5 or 5 times a power of
+    ten), as (start, end, count) rows
+    """
+    values = np.asarray(values, dtype='float64')
+    if len(values) == 0:
+        return pd.DataFrame({'start': [], 'end': [], 'count': []})
+    
+    target = (values.max() - values.min()) / bins or 1.0
+    magnitude = 10 ** np.floor(np.log10(target))
+    width = magnitude * min(step for step in (1, 2, 2.5, 5, 10) if step * magnitude >= target)
+    origin = np.floor(values.min() / width) * width
+    counts = np.bincount(((values - origin) // width).astype('int64'))
+    starts = origin + np.arange(len(counts)) * width
+    return pd.DataFrame({'start': starts, 'end': starts + width, 'count': counts})
+
+# Function to compute box plot statistics without shipping the values
+def box_summary(rows, quartiles, dim, measure='salary', whisker=1.5):
+    """Quartiles, whisker ends and outliers of `measure` per `dim` group.
+    
+    `quartiles` holds the planned 0.25/0.5/0.75 quantiles per group. Returns (stats with q1,
+    median, q3, lowerfence and upperfence per group, outlier rows with `dim` and `measure`).
+    """
+    stats = quartiles[[0.25, 0.5, 0.75]].set_axis(['q1', 'median', 'q3'], axis=1)
+    reach = whisker * (stats['q3'] - stats['q1'])
+    low = (stats['q1'] - reach).reindex(rows[dim]).to_numpy()
+    high = (stats['q3'] + reach).reindex(rows[dim]).to_numpy()
+    values = rows[measure].to_numpy(dtype='float64')
+    outside = (values < low) | (values > high)
+    
+    # Whiskers end at the most extreme values inside the fences
+    inside = rows[~outside].groupby(dim, observed=True)[measure].agg(['min', 'max'])
+    stats['lowerfence'] = inside['min']
+    stats['upperfence'] = inside['max']
+    return stats, rows.loc[outside, [dim, measure]]
+
+# Function to describe what a downsampled scatter shows
+def downsample_caption(points, heatmap, total, strategy):
+    """Caption noting the sample or binning behind a scatter, or None when every row is plotted"""
+    if heatmap is not None:
+        return f"{total:,} jobs binned into a heatmap; the {len(points):,} outliers are plotted as points"
+    if len(points) < total:
+        return f"Showing {len(points):,} of {total:,} jobs ({strategy.lower()}, fixed seed); outliers are always shown"
+    return None
@@ -1,9 +1,34 @@
 import streamlit as st
+from streamlit.proto.PlotlyChart_pb2 import PlotlyChart as PlotlyChartProto
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import numpy as np
+import collections
+import concurrent.futures
+import json
+import logging
+import os
+import threading
+import time
+import tracemalloc
+
+from analytics import (
+    AGGREGATE_DIMENSIONS, COMPANY_MIN_JOBS, DATA_PATH, FILTER_CATEGORY_COLUMNS, NUMERIC_COLUMNS, PERCENTILES,
+    QUANTILE_ERROR_OPTIONS, SALARY_LABELS, SALARY_SLIDER_STEP, SCATTER_HEATMAP_ROWS, SCATTER_MAX_POINTS,
+    SCATTER_STRATEGIES, SECTION_AGGREGATIONS, STATE_MIN_JOBS, STATE_TOP_N, STREAM_QUANTILE_ERROR,
+    TRAJECTORY_MIN_COUNT, TRAJECTORY_PERCENTILES, TRAJECTORY_SPLITS, TRAJECTORY_YEARS, aggregation_plan,
+    box_summary, build_cube, build_filter_index, build_key_rollups, build_salary_sketches,
+    category_level_salaries, category_stats, column_memory_report, company_leaderboards, downsample_caption,
+    downsample_scatter, drop_unused_categories, experience_level_counts, experience_level_stats, extend_cube,
+    extend_filter_index, extend_key_rollups, filter_rows, group_stats, histogram_bins, partial_aggregates,
+    plan_aggregations, refresh_jobs, rejected_rows_path, run_aggregations, salary_trajectory, salary_trend,
+    sample_heavy_hitters, sample_scale, scale_aggregates, select_cube_cells, select_sketches, stream_aggregates,
+    top_states, trajectory_aggregations,
+)
 
 # Page configuration
 st.set_page_config(
@@ -52,267 +77,690 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Function to categorize job titles
-def categorize_job_title(title):
-    """Categorize job titles into standardized role types"""
-    if pd.isna(title):
-        return 'Other'
-    
-    title_lower = str(title).lower()
-    
-    # Data Scientist category
-    if any(term in title_lower for term in ['data scientist', 'data science']):
-        return 'Data Scientist'
-    
-    # Machine Learning / AI category
-    elif any(term in title_lower for term in ['machine learning', 'ml engineer', 'ai engineer', 
-                                                'ai architect', 'ml scientist', 'applied scientist']):
-        return 'ML/AI Engineer'
-    
-    # Data Engineer category
-    elif any(term in title_lower for term in ['data engineer', 'data infrastructure', 'data platform']):
-        return 'Data Engineer'
-    
-    # Data Analyst category
-    elif any(term in title_lower for term in ['data analyst', 'business analyst', 'analytics']):
-        return 'Data Analyst'
+# Scatter backends: 'Auto' switches from SVG to WebGL above this many points
+SCATTER_BACKENDS = ['Auto', 'WebGL', 'SVG']
+WEBGL_POINT_THRESHOLD = 1000
+
+# Function to build a scatter with the chosen rendering backend
+def scatter_figure(df, x, y, backend='Auto', **scatter_args):
+    """px.scatter drawn with WebGL ('scattergl') or SVG; 'Auto' uses WebGL above WEBGL_POINT_THRESHOLD
+    points. Hover data, colors and sizes carry over to either backend.
+    """
+    webgl = backend == 'WebGL' or (backend == 'Auto' and len(df) > WEBGL_POINT_THRESHOLD)
+    return px.scatter(df, x=x, y=y, render_mode='webgl' if webgl else 'svg', **scatter_args)
+
+# Function to add a line drawn by the same backend as a figure's points
+def add_line_trace(fig, x, y, **line_args):
+    """Add a line, as a WebGL trace when the figure's points are WebGL so they share one layer"""
+    trace = go.Scattergl if any(t.type == 'scattergl' for t in fig.data) else go.Scatter
+    fig.add_trace(trace(x=x, y=y, mode='lines', **line_args))
+    return fig
+
+# Function to draw binned scatter counts with outliers on top
+def scatter_heatmap_figure(heatmap, outliers, x, y, backend='Auto', **scatter_args):
+    """Heatmap of the binned rows under a scatter of the outliers (scatter arguments apply to the outliers)"""
+    fig = scatter_figure(drop_unused_categories(outliers, [x]), x, y, backend, **scatter_args)
+    fig.update_traces(marker=dict(color='red', size=5), name='Outliers', showlegend=True)
+    fig.add_trace(go.Heatmap(
+        x=heatmap[x],
+        y=heatmap[y],
+        z=heatmap['count'],
+        colorscale='Viridis',
+        colorbar=dict(title='Jobs'),
+        name='Jobs',
+        hovertemplate='%{x}, %{y:,.0f}: %{z:,} jobs<extra></extra>'
+    ))
+    fig.data = fig.data[-1:] + fig.data[:-1]
+    return fig
+
+# Function to draw box plots from precomputed statistics
+def add_box_traces(fig, stats, outliers, dim, measure, colors, **box_args):
+    """One box per group of `stats` drawn from its summary (and mean/sd, if present), plus its outlier points"""
+    for i, (group, row) in enumerate(stats.iterrows()):
+        color = colors[i % len(colors)]
+        extra = {key: [row[key]] for key in ('mean', 'sd') if key in stats}
+        fig.add_trace(go.Box(
+            x=[group],
+            q1=[row['q1']],
+            median=[row['median']],
+            q3=[row['q3']],
+            lowerfence=[row['lowerfence']],
+            upperfence=[row['upperfence']],
+            name=str(group),
+            marker_color=color,
+            **extra,
+            **box_args
+        ))
+        points = outliers.loc[outliers[dim] == group, measure]
+        fig.add_trace(go.Scatter(
+            x=[group] * len(points),
+            y=points,
+            mode='markers',
+            name=str(group),
+            marker=dict(color=color, size=4),
+            showlegend=False
+        ))
+    return fig
+
+# Exports larger than this are ingested in streaming mode: read in chunks into the cube and salary
+# sketches, keeping only a uniform sample of rows for the charts that draw points. Each dataset
+# version records the mode it was built in as its 'mode' ('stream' or 'load')
+STREAMING_INGEST_BYTES = 2 * 2 ** 30
+
+# One dataset shared read-only by every session, with the cube and filter index built from it. Its
+# columns map the Arrow cache file, so worker processes serving the same file share its pages as
+# well. A refresh swaps in a new version; runs already under way keep the one they started with
+@st.cache_resource
+def load_dataset_store():
+    return {'lock': threading.Lock(), 'current': None}
+
+# Function to get the shared dataset, refreshing it first if asked
+def current_dataset(refresh=False):
+    """The current dataset version, loaded on first use"""
+    store = load_dataset_store()
+    with store['lock']:
+        if store['current'] is None or refresh:
+            store['current'] = build_dataset(store['current'])
+        return store['current']
+
+# Function to load the dataset, or bring a loaded one up to date with the CSV
+def build_dataset(previous=None):
+    """The jobs, cube, key rollups and filter index (plus the stream when streaming) for the CSV as
+    it is now.
     
-    # Research Scientist category
-    elif any(term in title_lower for term in ['research scientist', 'researcher']):
-        return 'Research Scientist'
+    Lines appended since `previous` was loaded are parsed and enriched on their own and merged into
+    it, the cache file, the cube, rollups and index; a rewritten CSV is loaded from scratch, as is
+    one that has grown past STREAMING_INGEST_BYTES since (in streaming mode from then on).
+    """
+    size = os.path.getsize(DATA_PATH)
+    version = 0 if previous is None else previous['version'] + 1
+    mode = 'stream' if size > STREAMING_INGEST_BYTES else 'load'
+    if previous is not None and previous['mode'] != mode:
+        previous = None
     
-    # Product/Decision Scientist category
-    elif any(term in title_lower for term in ['product scientist', 'decision scientist']):
-        return 'Product/Decision Scientist'
+    if mode == 'stream':
+        state = None if previous is None else previous['stream']['state']
+        if state is not None and state['offset'] == size:
+            return previous
+        stream = stream_aggregates(DATA_PATH, state)
+        return {'version': version, 'mode': mode, 'size': size, 'stream': stream, 'jobs': stream['sample'],
+                'cube': stream['cells'], 'key_rollups': stream['heavy_hitters'],
+                'index': build_filter_index(stream['sample'])}
     
-    # Statistician category
-    elif any(term in title_lower for term in ['statistician', 'biostatistician']):
-        return 'Statistician'
+    jobs, appended = refresh_jobs(DATA_PATH)
+    if previous is not None and appended is not None and len(previous['jobs']) + len(appended) == len(jobs):
+        if len(appended) == 0:
+            return dict(previous, size=size)
+        return {'version': version, 'mode': mode, 'size': size, 'jobs': jobs,
+                'cube': extend_cube(previous['cube'], jobs, appended),
+                'key_rollups': extend_key_rollups(previous['key_rollups'], jobs, appended),
+                'index': extend_filter_index(previous['index'], jobs)}
+    return {'version': version, 'mode': mode, 'size': size, 'jobs': jobs, 'cube': build_cube(jobs),
+            'key_rollups': build_key_rollups(jobs), 'index': build_filter_index(jobs)}
+
+# This run's dataset version, set by the script body below before anything reads it
+dataset = None
+
+def load_data():
+    return dataset['jobs']
+
+def load_filter_index():
+    return dataset['index']
+
+def load_cube():
+    return dataset['cube']
+
+@st.cache_data(max_entries=2)
+def load_memory_report(version):
+    return column_memory_report(load_data())
+
+# Salary sketches per error bound, kept with the dataset version they are built from
+def load_salary_sketches(relative_error):
+    if dataset['mode'] == 'stream':
+        return dataset['stream']['sketches']
+    sketches = dataset.setdefault('sketches', {})
+    if relative_error not in sketches:
+        sketches[relative_error] = build_salary_sketches(load_data(), relative_error)
+    return sketches[relative_error]
+
+# Sidebar choices: value ranges, and values most common first. Streaming reads them from the cube
+# and the heavy hitters rather than the sample, with the salary slider's stops on the cube's salary bins
+@st.cache_resource(max_entries=2)
+def load_filter_choices(version):
+    if dataset['mode'] == 'load':
+        df = load_data()
+        return {
+            'years_of_experience': (int(df['years_of_experience'].min()), int(df['years_of_experience'].max())),
+            'salary': (int(df['salary'].min()), int(df['salary'].max())),
+            'location_type': list(df['location_type'].unique()),
+            'city': list(df['city'].value_counts().head(50).index),
+            'company_name': list(df['company_name'].value_counts().head(50).index),
+            'job_category': sorted(list(df['job_category'].unique())),
+            'total_rows': len(df),
+        }
     
-    # Manager/Lead category
-    elif any(term in title_lower for term in ['manager', 'director', 'head of', 'vp', 'chief']):
-        return 'Manager/Lead'
+    cube = load_cube()
+    counts = {col: cube.groupby(col, observed=True)['count'].sum().sort_values(ascending=False, kind='stable')
+              for col in FILTER_CATEGORY_COLUMNS if col in cube}
+    counts.update({dims[0]: groups.set_index(dims[0])['count']
+                   for dims, groups in dataset['key_rollups'].items() if len(dims) == 1})
+    return {
+        'years_of_experience': (int(cube['years_min'].min()), int(cube['years_max'].max())),
+        'salary': (int(cube['salary_min'].min()) // SALARY_SLIDER_STEP * SALARY_SLIDER_STEP,
+                   int(cube['salary_max'].max())),
+        'location_type': list(counts['location_type'].index),
+        'city': list(counts['city'].head(50).index),
+        'company_name': list(counts['company_name'].head(50).index),
+        'job_category': sorted(counts['job_category'].index),
+        'total_rows': int(cube['count'].sum()),
+    }
+
+# Function to filter the data for one filter state
+def filter_view(ranges, categories, quantile_error):
+    """Positions of the filtered rows (None for all rows), their cube cells and, when `quantile_error`
+    is set, the salary sketches to merge. 'estimated' marks counts scaled up from the streamed sample
+    """
+    rows = filter_rows(load_filter_index(), ranges, categories)
+    view = {'rows': rows, 'n_rows': len(load_data()) if rows is None else len(rows)}
     
+    # Aggregates for the filtered rows come from the cube, and the company and city rollups it lacks from
+    # the key rollups (or the filtered rows, grouped for them alone). Rows are grouped in full if a bound
+    # splits a cube cell (never when streaming, where the slider stops match the cube's salary bins) or a
+    # city or company is selected; when streaming, the sample's rows stand in
+    cube_cells = select_cube_cells(load_cube(), ranges, categories)
+    view['key_groups'], view['estimated'] = None, False
+    if cube_cells is None:
+        view['cells'] = partial_aggregates(view_rows(view, AGGREGATE_DIMENSIONS + NUMERIC_COLUMNS), AGGREGATE_DIMENSIONS)
+        if dataset['mode'] == 'stream':
+            # Each sampled row stands for the jobs it was drawn from: a tracked company's or city's own
+            # count in the heavy hitters, else the whole file's
+            scale = sample_scale(load_data(), dataset['stream']['n_rows'], dataset['key_rollups'], categories)
+            view['cells'] = scale_aggregates(view['cells'], scale)
+            view['n_rows'], view['estimated'] = int(view['cells']['count'].sum()), True
     else:
-        return 'Other'
-
-# Load data with caching
-@st.cache_data
-def load_data():
-    df = pd.read_csv('data/linkedin_jobs.csv')
+        view['cells'] = cube_cells
+        if dataset['mode'] == 'stream':
+            view['n_rows'] = int(cube_cells['count'].sum())
+        if rows is None:
+            view['key_groups'] = dataset['key_rollups']
+        elif dataset['mode'] == 'stream':
+            view['key_groups'] = sample_heavy_hitters(view_rows(view, AGGREGATE_DIMENSIONS + NUMERIC_COLUMNS),
+                                                      view['n_rows'])
+        else:
+            view['key_groups'] = build_key_rollups(view_rows(view, AGGREGATE_DIMENSIONS + NUMERIC_COLUMNS))
     
-    # Create additional columns for analysis
-    df['experience_level'] = pd.cut(df['years_of_experience'], 
-                                     bins=[-1, 2, 5, 10, 50],
-                                     labels=['Entry (0-2)', 'Mid (3-5)', 'Senior (6-10)', 'Expert (10+)'])
+    # Approximate quantiles merge the sketches of the selected cube cells
+    view['sketches'] = None
+    if quantile_error and cube_cells is not None:
+        sketches = load_salary_sketches(quantile_error)
+        view['sketches'] = sketches if rows is None else select_sketches(sketches, cube_cells)
+    return view
+
+# Function to read a filtered view's rows from the shared dataset
+def view_rows(view, columns=None):
+    """The view's rows with at least `columns` (all when None). Unfiltered views get the shared,
+    read-only frame itself; filtered ones a copy of just the selected rows and columns.
+    """
+    df = load_data()
+    if view['rows'] is None:
+        return df
+    if columns is None:
+        return df.iloc[view['rows']]
+    return df.iloc[view['rows'], df.columns.get_indexer(list(dict.fromkeys(columns)))]
+
+# Function to run the planned aggregations for a filtered view
+def aggregate_view(view, sections):
+    """Rollups, quantiles and totals for the headline metrics and `sections` (all sections when None)"""
+    plan = aggregation_plan(sections)
+    rows = view_rows(view) if view['sketches'] is None else None
+    rollups, quantiles = run_aggregations(plan, view['cells'], rows, view['sketches'], view['key_groups'])
+    return {'rollups': rollups, 'quantiles': quantiles, 'totals': rollups[()].iloc[0]}
+
+# Shared caches: memory budgets for step results and serialized section figures, and seconds an
+# entry stays valid after it is built
+RESULT_CACHE_BYTES = 256 * 2 ** 20
+FIGURE_CACHE_BYTES = 64 * 2 ** 20
+RESULT_CACHE_TTL = 30 * 60
+
+# Streamlit chart theme the figures are drawn with; cached figure payloads are keyed on it and on
+# the default plotly template
+FIGURE_THEME = 'streamlit'
+
+# Streamlit release series whose plotly chart element show_figure fills in itself (the one
+# requirements.txt pins); other series, or a release whose element has lost a field it sets, render
+# through st.plotly_chart, with a warning logged once per process
+FIGURE_ELEMENT_VERSIONS = ('1.31',)
+FIGURE_ELEMENT_FIELDS = {'figure': ('spec', 'config'), 'use_container_width': (), 'theme': ()}
+
+# Performance instrumentation: this run's step records while it is switched on, else None (so the
+# timing hooks below cost one check); instrumented runs kept per session for export
+perf_log = None
+PERF_HISTORY_RUNS = 50
+
+# Function to start timing a step
+def perf_start():
+    """Start time and traced memory for perf_record, or None when instrumentation is off"""
+    if perf_log is None:
+        return None
+    return time.perf_counter(), tracemalloc.get_traced_memory()[0]
+
+# Function to log a timed step
+def perf_record(started, step, kind, **fields):
+    """Add `step`'s wall time and traced memory change since perf_start to this run's log"""
+    if started is None:
+        return
+    start, memory = started
+    perf_log.append({
+        'step': step,
+        'kind': kind,
+        'ms': round((time.perf_counter() - start) * 1000, 2),
+        'memory_mb': round((tracemalloc.get_traced_memory()[0] - memory) / 2 ** 20, 3),
+        **fields,
+    })
+
+# Tracing shared by the process's instrumented runs: how many are in progress, and whether they
+# started tracemalloc (so it is left running when something else had started it)
+@st.cache_resource
+def load_memory_tracer():
+    return {'lock': threading.Lock(), 'runs': 0, 'started': False}
+
+# Function to trace memory for an instrumented run
+def start_memory_trace():
+    """Start tracemalloc for the first of the process's instrumented runs in progress"""
+    tracer = load_memory_tracer()
+    with tracer['lock']:
+        if tracer['runs'] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            tracer['started'] = True
+        tracer['runs'] += 1
+
+# Function to end an instrumented run's memory tracing
+def stop_memory_trace():
+    """Stop tracemalloc once the last instrumented run is done, if one of them started it"""
+    tracer = load_memory_tracer()
+    with tracer['lock']:
+        tracer['runs'] -= 1
+        if tracer['runs'] == 0 and tracer['started']:
+            tracemalloc.stop()
+            tracer['started'] = False
+
+# Function to list the objects cached results share with the dataset
+def dataset_objects():
+    """The dataset's frames, arrays and salary sketches, with its frames' indexes and category values,
+    by id: results reference these rather than own them
+    """
+    shared = {}
+    pending = [dataset]
+    while pending:
+        value = pending.pop()
+        shared[id(value)] = value
+        if isinstance(value, dict):
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple)):
+            pending.extend(value)
+        elif isinstance(value, pd.DataFrame):
+            pending.append(value.index)
+            pending.extend(dtype.categories for dtype in value.dtypes if isinstance(dtype, pd.CategoricalDtype))
+    return shared
+
+# Function to estimate the memory held by a result
+def result_size(value, seen=None):
+    """Approximate bytes held by `value`: frame and array buffers, strings (object columns
+    included), containers, and figures through their (unserialized) plotly dict.
     
-    df['salary_range'] = pd.cut(df['salary'], 
-                                 bins=[0, 100000, 150000, 200000, 250000, 1000000],
-                                 labels=['<$100k', '$100k-$150k', '$150k-$200k', '$200k-$250k', '>$250k'])
+    Each object is counted once, and none that the dataset holds (`seen` maps ids to the objects
+    already counted, the dataset's to start), so sketches, cube cells and category values shared
+    by many cached views aren't charged to each of them.
+    """
+    if seen is None:
+        seen = dataset_objects()
+    if id(value) in seen:
+        return 0
+    seen[id(value)] = value  # kept alive, so the id isn't reused by a later temporary
     
-    # Extract location type
-    df['location_type'] = df['location'].apply(lambda x: 
-        'Remote' if 'Remote' in str(x) else 
-        'Hybrid' if 'Hybrid' in str(x) else 
-        'On-site' if 'On-site' in str(x) else 
-        'Unknown')
+    if isinstance(value, pd.DataFrame):
+        return result_size(value.index, seen) + sum(result_size(value.iloc[:, i], seen) for i in range(value.shape[1]))
+    if isinstance(value, (pd.Series, pd.Index)):
+        index_size = result_size(value.index, seen) if isinstance(value, pd.Series) else 0
+        if isinstance(value.dtype, pd.CategoricalDtype):
+            codes = value.cat.codes if isinstance(value, pd.Series) else value.codes
+            return index_size + codes.nbytes + result_size(value.dtype.categories, seen)
+        return index_size + int(value.memory_usage(deep=True) if isinstance(value, pd.Index)
+                                else value.memory_usage(index=False, deep=True))
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, go.Figure):
+        return result_size(value.to_plotly_json(), seen)
+    if isinstance(value, dict):
+        return sum(result_size(item, seen) for item in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(result_size(item, seen) for item in value)
+    if isinstance(value, str):
+        return len(value)
+    return 64
+
+@st.cache_resource
+def load_result_cache(store='results'):
+    """Process-wide cache `store` ('results' or 'figures') shared by every session, in least to most
+    recently used order
+    """
+    budget = {'results': RESULT_CACHE_BYTES, 'figures': FIGURE_CACHE_BYTES}[store]
+    return {'entries': collections.OrderedDict(), 'budget': budget, 'bytes': 0, 'hits': 0, 'misses': 0,
+            'evictions': 0, 'lock': threading.Lock()}
+
+# Function to reuse a step's result across reruns and sessions while its inputs are unchanged
+def cached_step(name, inputs, build, *args, store='results'):
+    """`build(*args)`, or the shared cache's result of step `name` for equal `inputs`.
     
-    # Extract state from location
-    df['state'] = df['location'].str.extract(r', ([A-Z]{2})')[0]
+    Entries expire RESULT_CACHE_TTL seconds after they are built, and least recently used ones are
+    evicted once the cache holds more than its budget.
+    """
+    started = perf_start()
+    cache = load_result_cache(store)
+    key = (name, inputs)
+    with cache['lock']:
+        entry = cache['entries'].get(key)
+        if entry is not None and time.monotonic() - entry['built'] < RESULT_CACHE_TTL:
+            cache['entries'].move_to_end(key)
+            cache['hits'] += 1
+            perf_record(started, name, 'step', cache='hit')
+            return entry['value']
+        cache['misses'] += 1
     
-    # Categorize job roles
-    df['job_category'] = df['job_title'].apply(categorize_job_title)
+    # Build outside the lock so sessions don't wait on each other
+    value = build(*args)
+    entry = {'value': value, 'size': result_size(value), 'built': time.monotonic()}
     
-    return df
-
-# Load the data
-df = load_data()
-
-# Sidebar filters
-st.sidebar.title("Filters")
-
-# Experience filter
-exp_range = st.sidebar.slider(
-    "Years of Experience",
-    min_value=int(df['years_of_experience'].min()),
-    max_value=int(df['years_of_experience'].max()),
-    value=(int(df['years_of_experience'].min()), int(df['years_of_experience'].max()))
-)
-
-# Salary filter
-salary_range = st.sidebar.slider(
-    "Salary Range (USD)",
-    min_value=int(df['salary'].min()),
-    max_value=int(df['salary'].max()),
-    value=(int(df['salary'].min()), int(df['salary'].max())),
-    step=10000,
-    format="$%d"
-)
-
-# Location type filter
-location_types = ['All'] + list(df['location_type'].unique())
-selected_location_type = st.sidebar.selectbox("Location Type", location_types)
-
-# Company filter
-top_companies = ['All'] + list(df['company_name'].value_counts().head(50).index)
-selected_company = st.sidebar.selectbox("Company (Top 50)", top_companies)
-
-# Job category filter
-job_categories = ['All'] + sorted(list(df['job_category'].unique()))
-selected_category = st.sidebar.selectbox("Job Category", job_categories)
-
-# Apply filters
-filtered_df = df[
-    (df['years_of_experience'] >= exp_range[0]) &
-    (df['years_of_experience'] <= exp_range[1]) &
-    (df['salary'] >= salary_range[0]) &
-    (df['salary'] <= salary_range[1])
-]
-
-if selected_location_type != 'All':
-    filtered_df = filtered_df[filtered_df['location_type'] == selected_location_type]
-
-if selected_company != 'All':
-    filtered_df = filtered_df[filtered_df['company_name'] == selected_company]
-
-if selected_category != 'All':
-    filtered_df = filtered_df[filtered_df['job_category'] == selected_category]
-
-# Main title
-st.title("LinkedIn Jobs Market Analytics Dashboard")
-st.markdown(f"Analyzing **{len(filtered_df):,}** jobs from a dataset of **{len(df):,}** total positions")
-st.markdown("**15 Interactive Visualizations** | Filter data using sidebar controls")
-
-# Key metrics
-col1, col2, col3, col4, col5 = st.columns(5)
-
-with col1:
-    st.metric("Total Jobs", f"{len(filtered_df):,}")
+    with cache['lock']:
+        entries = cache['entries']
+        if key in entries:
+            cache['bytes'] -= entries.pop(key)['size']
+        entries[key] = entry
+        cache['bytes'] += entry['size']
+        
+        expired = [k for k, e in entries.items() if entry['built'] - e['built'] >= RESULT_CACHE_TTL]
+        while len(entries) > 1 and (expired or cache['bytes'] > cache['budget']):
+            cache['bytes'] -= entries.pop(expired.pop() if expired else next(iter(entries)))['size']
+            cache['evictions'] += 1
+    perf_record(started, name, 'step', cache='miss', result_mb=round(entry['size'] / 2 ** 20, 3))
+    return value
+
+# Function to summarize a shared cache
+def result_cache_stats(store='results'):
+    """Entries, memory and hit/miss counters of the shared cache `store`"""
+    cache = load_result_cache(store)
+    with cache['lock']:
+        lookups = cache['hits'] + cache['misses']
+        return {
+            'Entries': len(cache['entries']),
+            'Memory (MB)': round(cache['bytes'] / 2 ** 20, 1),
+            'Budget (MB)': round(cache['budget'] / 2 ** 20, 1),
+            'Hits': cache['hits'],
+            'Misses': cache['misses'],
+            'Hit rate': f"{cache['hits'] / lookups:.0%}" if lookups else 'n/a',
+            'Evictions': cache['evictions'],
+        }
+
+# Sections with widgets of their own rerun alone where Streamlit has fragments (1.33+); before that a
+# widget change reruns the script, but every section whose inputs are unchanged reuses its results
+section_fragment = getattr(st, 'fragment', None) or getattr(st, 'experimental_fragment', None) or (lambda render: render)
+
+# Section renderers by number, with their header and the shared view values their output depends on
+SECTIONS = {}
+
+# Function to register a dashboard section
+def dashboard_section(number, title, inputs=('filters',), fragment=False, build=None):
+    """Register a section renderer; `fragment` marks sections with widgets of their own, and `build`
+    is the section's build function when it takes no widget values, so it can be scheduled ahead
+    """
+    def register(render):
+        SECTIONS[number] = {'title': title, 'inputs': inputs, 'build': build,
+                            'render': section_fragment(render) if fragment else render}
+        return render
+    return register
+
+# Function to build a section's figures, reusing them while its inputs are unchanged
+def section_result(number, view, build, *widgets):
+    """`build(view, *widgets)` with its figures serialized, rerun only when the section's declared
+    inputs, its widget values or the figure theme change; scheduled sections wait for their build
+    """
+    scheduled = view.get('scheduled', {}).get(number)
+    if scheduled is not None and not widgets:
+        return scheduled.result()
+    return cached_section(number, view, build, *widgets)
+
+def cached_section(number, view, build, *widgets):
+    """`build(view, *widgets)` through the shared figure cache"""
+    inputs = tuple(view[name] for name in SECTIONS[number]['inputs']) + widgets
+    theme = (pio.templates.default, FIGURE_THEME)
+    return cached_step(f'section {number}', (inputs, theme), serialized_section, build, view, *widgets,
+                       store='figures')
+
+# Function to build a section and serialize its figures
+def serialized_section(build, *args):
+    """`build(*args)` with every figure replaced by its plotly JSON, ready for show_figure"""
+    started = perf_start()
+    result = build(*args)
+    perf_record(started, build.__name__, 'build')
     
-with col2:
-    st.metric("Median Salary", f"${filtered_df['salary'].median():,.0f}")
+    for key, value in result.items():
+        if isinstance(value, go.Figure):
+            started = perf_start()
+            result[key] = pio.to_json(value, validate=False)
+            perf_record(started, f'{build.__name__} {key}', 'serialize', figure_kb=round(len(result[key]) / 1024, 1))
+    return result
+
+# Sections built ahead of rendering use this many threads of a shared pool by default, and at most
+# MAX_SECTION_WORKERS (the pool's size); 1 builds each section as it is rendered
+SECTION_WORKERS = min(4, os.cpu_count() or 1)
+MAX_SECTION_WORKERS = max(os.cpu_count() or 1, 2)
+
+@st.cache_resource
+def load_section_pool():
+    """Thread pool shared by every session for building sections"""
+    return concurrent.futures.ThreadPoolExecutor(max_workers=MAX_SECTION_WORKERS, thread_name_prefix='section')
+
+# Function to start building sections ahead of rendering
+def schedule_sections(view, numbers, workers):
+    """Futures of the sections among `numbers` registered with a build, built by at most `workers`
+    of the shared pool's threads at a time.
     
-with col3:
-    st.metric("Avg Salary", f"${filtered_df['salary'].mean():,.0f}")
+    Most of a build is pandas/NumPy work that releases the GIL, so sections build concurrently
+    while the renderer shows the ones before them in order. Each of the run's `workers` tasks
+    takes the next unbuilt section until none are left, so a run never holds more threads than
+    it asked for and the pool is the same whatever the slider says.
+    """
+    if workers <= 1:
+        return {}
     
-with col4:
-    st.metric("Avg Experience", f"{filtered_df['years_of_experience'].mean():.1f} yrs")
+    futures = {number: concurrent.futures.Future() for number in numbers if SECTIONS[number]['build'] is not None}
+    pending = iter(list(futures))
+    pending_lock = threading.Lock()
+    ctx = get_script_run_ctx()
+    def build_pending():
+        add_script_run_ctx(threading.current_thread(), ctx)
+        while True:
+            with pending_lock:
+                number = next(pending, None)
+            if number is None:
+                return
+            if not futures[number].set_running_or_notify_cancel():
+                continue
+            try:
+                futures[number].set_result(cached_section(number, view, SECTIONS[number]['build']))
+            except BaseException as error:
+                futures[number].set_exception(error)
     
-with col5:
-    st.metric("Top Company", filtered_df['company_name'].value_counts().index[0] if len(filtered_df) > 0 else "N/A")
-
-st.markdown("---")
+    pool = load_section_pool()
+    for _ in range(min(workers, len(futures))):
+        pool.submit(build_pending)
+    return futures
+
+# Function to check whether show_figure can fill in the chart element itself
+@st.cache_resource
+def figure_element_supported():
+    """Whether this Streamlit release has the chart element show_figure fills in; logs why not"""
+    series = '.'.join(st.__version__.split('.')[:2])
+    fields = PlotlyChartProto.DESCRIPTOR.fields_by_name
+    missing = []
+    for name, subfields in FIGURE_ELEMENT_FIELDS.items():
+        if name not in fields:
+            missing.append(name)
+            continue
+        missing += [f'{name}.{sub}' for sub in subfields if sub not in fields[name].message_type.fields_by_name]
+    if series not in FIGURE_ELEMENT_VERSIONS:
+        reason = f"Streamlit {st.__version__} is not in the supported series {FIGURE_ELEMENT_VERSIONS}"
+    elif missing:
+        reason = f"the plotly chart element has no {', '.join(missing)}"
+    elif not hasattr(st._main, '_enqueue'):
+        reason = "the main container has no _enqueue"
+    else:
+        return True
+    logging.getLogger(__name__).warning(
+        "Drawing figures through st.plotly_chart, which rebuilds each one: %s", reason)
+    return False
+
+# Function to draw a figure from its cached plotly JSON
+def show_figure(spec):
+    """st.plotly_chart for a figure serialized by serialized_section. Where figure_element_supported
+    the spec goes into the chart element as it is, without rebuilding, validating and reserializing
+    the figure; otherwise it takes the public st.plotly_chart path
+    """
+    if not figure_element_supported():
+        return st.plotly_chart(pio.from_json(spec, skip_invalid=True), use_container_width=True, theme=FIGURE_THEME)
+    chart = PlotlyChartProto()
+    chart.use_container_width = True
+    chart.figure.spec = spec
+    chart.figure.config = json.dumps({'showLink': False, 'linkText': False})
+    chart.theme = FIGURE_THEME
+    return st._main._enqueue('plotly_chart', chart)
 
 # Visualization 1: Salary vs Experience Scatter Plot
-st.header("1. Salary vs Experience Analysis")
-col1, col2 = st.columns([3, 1])
-
-with col1:
-    fig1 = px.scatter(
-        filtered_df, 
-        x='years_of_experience', 
-        y='salary',
-        color='salary',
-        color_continuous_scale='Viridis',
-        hover_data=['job_title', 'company_name', 'location'],
+def build_section_1(view):
+    rollups, totals = view['rollups'], view['totals']
+    hover_columns = ['job_title', 'company_name', 'location']
+    filtered_df = view_rows(view, ['years_of_experience', 'salary', 'experience_level'] + hover_columns)
+    scatter_points, scatter_bins, scatter_used = downsample_scatter(
+        filtered_df, 'years_of_experience', 'salary', view['scatter_strategy'], stratify_by='experience_level'
+    )
+    scatter_args = dict(
+        hover_data=hover_columns,
         title='Salary vs Years of Experience (Hover for details)',
         labels={'years_of_experience': 'Years of Experience', 'salary': 'Salary (USD)'},
         height=500
     )
     
+    if scatter_bins is not None:
+        fig1 = scatter_heatmap_figure(scatter_bins, scatter_points, 'years_of_experience', 'salary',
+                                      view['scatter_backend'], **scatter_args)
+    else:
+        fig1 = scatter_figure(
+            scatter_points,
+            'years_of_experience',
+            'salary',
+            view['scatter_backend'],
+            color='salary',
+            color_continuous_scale='Viridis',
+            **scatter_args
+        )
+    
     # Add trend line
-    z = np.polyfit(filtered_df['years_of_experience'], filtered_df['salary'], 1)
-    p = np.poly1d(z)
-    x_trend = np.linspace(filtered_df['years_of_experience'].min(), 
-                          filtered_df['years_of_experience'].max(), 100)
-    
-    fig1.add_trace(go.Scatter(
-        x=x_trend, 
-        y=p(x_trend),
-        mode='lines',
+    slope, intercept, correlation = salary_trend(totals)
+    x_trend = np.linspace(totals['years_min'], totals['years_max'], 100)
+    
+    add_line_trace(
+        fig1,
+        x_trend,
+        intercept + slope * x_trend,
         name='Trend Line',
         line=dict(color='red', dash='dash', width=2)
-    ))
-    
+    )
     fig1.update_layout(showlegend=True)
-    st.plotly_chart(fig1, use_container_width=True)
-
-with col2:
-    st.subheader("Insights")
-    correlation = filtered_df['years_of_experience'].corr(filtered_df['salary'])
-    st.metric("Correlation", f"{correlation:.3f}")
-    
-    avg_increase = (filtered_df[filtered_df['years_of_experience'] > 5]['salary'].mean() - 
-                   filtered_df[filtered_df['years_of_experience'] <= 5]['salary'].mean())
-    st.metric("Salary Jump (5+ yrs)", f"${avg_increase:,.0f}")
-    
-    st.markdown(f"""
-    **Key Findings:**
-    - {len(filtered_df)} data points analyzed
-    - Salary increases ~${z[0]:,.0f} per year
-    - Strong positive correlation
-    """)
+    
+    years_stats = rollups[('years_of_experience',)]
+    senior = years_stats.index > 5
+    avg_increase = (years_stats.loc[senior, 'salary_sum'].sum() / years_stats.loc[senior, 'count'].sum() -
+                   years_stats.loc[~senior, 'salary_sum'].sum() / years_stats.loc[~senior, 'count'].sum())
+    
+    return {
+        'fig': fig1,
+        'caption': downsample_caption(scatter_points, scatter_bins, len(filtered_df), scatter_used),
+        'correlation': correlation,
+        'slope': slope,
+        'avg_increase': avg_increase,
+    }
 
-st.markdown("---")
+@dashboard_section(1, "1. Salary vs Experience Analysis",
+                   inputs=('filters', 'scatter_strategy', 'scatter_backend'), build=build_section_1)
+def render_section_1(view):
+    result = section_result(1, view, build_section_1)
+    col1, col2 = st.columns([3, 1])
+    
+    with col1:
+        show_figure(result['fig'])
+        if result['caption']:
+            st.caption(result['caption'])
+    
+    with col2:
+        st.subheader("Insights")
+        st.metric("Correlation", f"{result['correlation']:.3f}")
+        st.metric("Salary Jump (5+ yrs)", f"${result['avg_increase']:,.0f}")
+        
+        st.markdown(f"""
+        **Key Findings:**
+        - {view['n_rows']} data points analyzed
+        - Salary increases ~${result['slope']:,.0f} per year
+        - Strong positive correlation
+        """)
 
 # Visualization 2: Average Salary by Experience Level
-st.header("2. Salary by Career Level")
-
-exp_level_stats = filtered_df.groupby('experience_level', observed=False).agg({
-    'salary': ['mean', 'median', 'count']
-}).round(0)
-exp_level_stats.columns = ['Average Salary', 'Median Salary', 'Job Count']
-exp_level_stats = exp_level_stats.reset_index()
-
-fig2 = make_subplots(specs=[[{"secondary_y": True}]])
-
-fig2.add_trace(
-    go.Bar(
-        x=exp_level_stats['experience_level'],
-        y=exp_level_stats['Average Salary'],
-        name='Average Salary',
-        marker_color='lightblue',
-        text=exp_level_stats['Average Salary'].apply(lambda x: f'${x:,.0f}'),
-        textposition='outside'
-    ),
-    secondary_y=False
-)
-
-fig2.add_trace(
-    go.Scatter(
-        x=exp_level_stats['experience_level'],
-        y=exp_level_stats['Job Count'],
-        name='Job Count',
-        mode='lines+markers',
-        line=dict(color='red', width=3),
-        marker=dict(size=10)
-    ),
-    secondary_y=True
-)
-
-fig2.update_xaxes(title_text="Career Level")
-fig2.update_yaxes(title_text="Average Salary (USD)", secondary_y=False)
-fig2.update_yaxes(title_text="Number of Jobs", secondary_y=True)
-fig2.update_layout(title="Average Salary and Job Count by Career Level", height=500)
-
-st.plotly_chart(fig2, use_container_width=True)
+def build_section_2(view):
+    # Empty career levels stay on the axis
+    exp_level_stats = experience_level_stats(view['rollups'], view['quantiles'])
+    exp_level_stats = exp_level_stats[['mean', 'median', 'count']].round(0)
+    exp_level_stats.columns = ['Average Salary', 'Median Salary', 'Job Count']
+    exp_level_stats = exp_level_stats.reset_index()
+    
+    fig2 = make_subplots(specs=[[{"secondary_y": True}]])
+    
+    fig2.add_trace(
+        go.Bar(
+            x=exp_level_stats['experience_level'],
+            y=exp_level_stats['Average Salary'],
+            name='Average Salary',
+            marker_color='lightblue',
+            text=exp_level_stats['Average Salary'].apply(lambda x: f'${x:,.0f}'),
+            textposition='outside'
+        ),
+        secondary_y=False
+    )
+    
+    fig2.add_trace(
+        go.Scatter(
+            x=exp_level_stats['experience_level'],
+            y=exp_level_stats['Job Count'],
+            name='Job Count',
+            mode='lines+markers',
+            line=dict(color='red', width=3),
+            marker=dict(size=10)
+        ),
+        secondary_y=True
+    )
+    
+    fig2.update_xaxes(title_text="Career Level")
+    fig2.update_yaxes(title_text="Average Salary (USD)", secondary_y=False)
+    fig2.update_yaxes(title_text="Number of Jobs", secondary_y=True)
+    fig2.update_layout(title="Average Salary and Job Count by Career Level", height=500)
+    return {'fig': fig2}
 
-st.markdown("---")
+@dashboard_section(2, "2. Salary by Career Level", build=build_section_2)
+def render_section_2(view):
+    result = section_result(2, view, build_section_2)
+    show_figure(result['fig'])
 
 # Visualization 3: Top Companies Analysis
-st.header("3. Top Hiring Companies")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    st.subheader("By Job Count")
-    top_companies_count = filtered_df['company_name'].value_counts().head(20).reset_index()
-    top_companies_count.columns = ['Company', 'Job Count']
-    
-    # Add average salary
-    top_companies_count['Avg Salary'] = top_companies_count['Company'].apply(
-        lambda x: filtered_df[filtered_df['company_name'] == x]['salary'].mean()
-    )
+def build_section_3(view):
+    top_companies_count, company_salary = company_leaderboards(view['rollups'][('company_name',)], top_n=20)
     
     fig3a = px.bar(
         top_companies_count,
@@ -326,17 +774,6 @@ with col1:
         height=600
     )
     fig3a.update_layout(yaxis={'categoryorder': 'total ascending'})
-    st.plotly_chart(fig3a, use_container_width=True)
-
-with col2:
-    st.subheader("By Average Salary")
-    company_salary = filtered_df.groupby('company_name', observed=False).agg({
-        'salary': 'mean',
-        'job_title': 'count'
-    }).reset_index()
-    company_salary.columns = ['Company', 'Avg Salary', 'Job Count']
-    company_salary = company_salary[company_salary['Job Count'] >= 5]  # At least 5 jobs
-    company_salary = company_salary.nlargest(20, 'Avg Salary')
     
     fig3b = px.bar(
         company_salary,
@@ -346,45 +783,75 @@ with col2:
         color='Job Count',
         color_continuous_scale='Blues',
         hover_data={'Job Count': True},
-        title='Top 20 Highest Paying Companies (min 5 jobs)',
+        title=f'Top 20 Highest Paying Companies (min {COMPANY_MIN_JOBS} jobs)',
         height=600
     )
     fig3b.update_layout(yaxis={'categoryorder': 'total ascending'})
-    st.plotly_chart(fig3b, use_container_width=True)
-
-st.markdown("---")
+    return {'fig_count': fig3a, 'fig_salary': fig3b}
+
+def build_leaderboards(view, leaderboard_size):
+    boards = []
+    for board in company_leaderboards(view['rollups'][('company_name',)], top_n=leaderboard_size):
+        board['Avg Salary'] = board['Avg Salary'].apply(lambda x: f'${x:,.0f}')
+        boards.append(board)
+    return boards
+
+@dashboard_section(3, "3. Top Hiring Companies", fragment=True, build=build_section_3)
+def render_section_3(view):
+    result = section_result(3, view, build_section_3)
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader("By Job Count")
+        show_figure(result['fig_count'])
+    
+    with col2:
+        st.subheader("By Average Salary")
+        show_figure(result['fig_salary'])
+    
+    with st.expander("Company Leaderboards"):
+        leaderboard_size = st.selectbox("Companies per leaderboard", [100, 1000], key='leaderboard_size')
+        boards = cached_step('section 3 leaderboards', (view['filters'], leaderboard_size),
+                             build_leaderboards, view, leaderboard_size)
+        col1, col2 = st.columns(2)
+        for col, board in zip((col1, col2), boards):
+            col.dataframe(board, use_container_width=True, hide_index=True, height=400)
 
 # Visualization 4: Salary Distribution
-st.header("4. Salary Distribution Analysis")
-
-col1, col2 = st.columns([2, 1])
-
-with col1:
+def build_section_4(view):
+    rollups, totals = view['rollups'], view['totals']
+    salary_percentiles = view['quantiles'][(), 'salary'].iloc[0]
+    median_salary = salary_percentiles[0.5]
+    
     fig4 = go.Figure()
     
-    fig4.add_trace(go.Histogram(
-        x=filtered_df['salary'],
-        nbinsx=50,
+    # Bin on the server so only the bin counts are sent
+    salary_hist = histogram_bins(view_rows(view, ['salary'])['salary'])
+    fig4.add_trace(go.Bar(
+        x=(salary_hist['start'] + salary_hist['end']) / 2,
+        y=salary_hist['count'],
+        width=salary_hist['end'] - salary_hist['start'],
+        customdata=salary_hist[['start', 'end']],
+        hovertemplate='$%{customdata[0]:,.0f} - $%{customdata[1]:,.0f}: %{y:,} jobs<extra></extra>',
         name='Salary Distribution',
         marker_color='steelblue',
         opacity=0.7
     ))
     
     # Add median line
-    median_salary = filtered_df['salary'].median()
     fig4.add_vline(
-        x=median_salary, 
-        line_dash="dash", 
+        x=median_salary,
+        line_dash="dash",
         line_color="red",
         annotation_text=f"Median: ${median_salary:,.0f}",
         annotation_position="top"
     )
     
     # Add mean line
-    mean_salary = filtered_df['salary'].mean()
+    mean_salary = totals['salary_mean']
     fig4.add_vline(
-        x=mean_salary, 
-        line_dash="dash", 
+        x=mean_salary,
+        line_dash="dash",
         line_color="green",
         annotation_text=f"Mean: ${mean_salary:,.0f}",
         annotation_position="bottom"
@@ -394,43 +861,45 @@ with col1:
         title='Salary Distribution with Median and Mean',
         xaxis_title='Salary (USD)',
         yaxis_title='Number of Jobs',
-        height=500
+        height=500,
+        bargap=0
     )
     
-    st.plotly_chart(fig4, use_container_width=True)
-
-with col2:
-    st.subheader("Percentiles")
-    percentiles = [10, 25, 50, 75, 90, 95]
     perc_data = []
-    for p in percentiles:
-        value = filtered_df['salary'].quantile(p/100)
+    for p in PERCENTILES:
+        value = salary_percentiles[p/100]
         perc_data.append({'Percentile': f'{p}th', 'Salary': f'${value:,.0f}'})
     
-    perc_df = pd.DataFrame(perc_data)
-    st.dataframe(perc_df, use_container_width=True, hide_index=True)
-    
-    st.subheader("Salary Ranges")
-    salary_range_counts = filtered_df['salary_range'].value_counts().sort_index()
+    range_lines = []
+    salary_range_counts = rollups[('salary_range',)]['count'].reindex(SALARY_LABELS, fill_value=0)
     for range_name, count in salary_range_counts.items():
-        pct = (count / len(filtered_df)) * 100
-        st.write(f"**{range_name}**: {count:,} jobs ({pct:.1f}%)")
+        pct = (count / view['n_rows']) * 100
+        range_lines.append(f"**{range_name}**: {count:,} jobs ({pct:.1f}%)")
+    
+    return {'fig': fig4, 'percentiles': pd.DataFrame(perc_data), 'ranges': range_lines}
 
-st.markdown("---")
+@dashboard_section(4, "4. Salary Distribution Analysis", build=build_section_4)
+def render_section_4(view):
+    result = section_result(4, view, build_section_4)
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        show_figure(result['fig'])
+    
+    with col2:
+        st.subheader("Percentiles")
+        st.dataframe(result['percentiles'], use_container_width=True, hide_index=True)
+        
+        st.subheader("Salary Ranges")
+        for line in result['ranges']:
+            st.write(line)
 
 # Visualization 5: Geographic Analysis
-st.header("5. Geographic Salary Analysis")
-
-state_stats = filtered_df.groupby('state', observed=False).agg({
-    'salary': ['mean', 'median', 'count']
-}).round(0)
-state_stats.columns = ['Avg Salary', 'Median Salary', 'Job Count']
-state_stats = state_stats[state_stats['Job Count'] >= 50].sort_values('Avg Salary', ascending=False).head(20)
-state_stats = state_stats.reset_index()
-
-col1, col2 = st.columns([2, 1])
-
-with col1:
+def build_section_5(view):
+    state_stats = top_states(view['rollups'], view['quantiles'])[['mean', 'median', 'count']].round(0)
+    state_stats.columns = ['Avg Salary', 'Median Salary', 'Job Count']
+    state_stats = state_stats.reset_index()
+    
     fig5 = px.bar(
         state_stats,
         x='state',
@@ -438,29 +907,30 @@ with col1:
         color='Job Count',
         color_continuous_scale='Plasma',
         hover_data=['Median Salary', 'Job Count'],
-        title='Top 20 States by Average Salary (min 50 jobs)',
+        title=f'Top {STATE_TOP_N} States by Average Salary (min {STATE_MIN_JOBS} jobs)',
         labels={'state': 'State', 'Avg Salary': 'Average Salary (USD)'},
         height=500
     )
-    st.plotly_chart(fig5, use_container_width=True)
-
-with col2:
-    st.subheader("Top States Table")
+    
     display_df = state_stats[['state', 'Avg Salary', 'Job Count']].copy()
     display_df['Avg Salary'] = display_df['Avg Salary'].apply(lambda x: f'${x:,.0f}')
-    st.dataframe(display_df, use_container_width=True, hide_index=True, height=400)
+    return {'fig': fig5, 'table': display_df}
 
-st.markdown("---")
+@dashboard_section(5, "5. Geographic Salary Analysis", build=build_section_5)
+def render_section_5(view):
+    result = section_result(5, view, build_section_5)
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        show_figure(result['fig'])
+    
+    with col2:
+        st.subheader("Top States Table")
+        st.dataframe(result['table'], use_container_width=True, hide_index=True, height=400)
 
 # Visualization 6: Remote vs Hybrid vs On-site
-st.header("6. Work Location Type Analysis")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    location_stats = filtered_df.groupby('location_type', observed=False).agg({
-        'salary': ['mean', 'median', 'count']
-    }).round(0)
+def build_section_6(view):
+    location_stats = group_stats(view['rollups'], view['quantiles'], 'location_type')[['mean', 'median', 'count']].round(0)
     location_stats.columns = ['Average', 'Median', 'Count']
     location_stats = location_stats.reset_index()
     
@@ -492,55 +962,64 @@ with col1:
         height=500
     )
     
-    st.plotly_chart(fig6a, use_container_width=True)
-
-with col2:
     fig6b = px.pie(
-        filtered_df,
+        location_stats,
         names='location_type',
+        values='Count',
         title='Distribution of Jobs by Location Type',
         hole=0.4,
         height=500
     )
     fig6b.update_traces(textposition='inside', textinfo='percent+label')
-    st.plotly_chart(fig6b, use_container_width=True)
+    return {'fig_salary': fig6a, 'fig_share': fig6b}
 
-st.markdown("---")
+@dashboard_section(6, "6. Work Location Type Analysis", build=build_section_6)
+def render_section_6(view):
+    result = section_result(6, view, build_section_6)
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        show_figure(result['fig_salary'])
+    
+    with col2:
+        show_figure(result['fig_share'])
 
 # Visualization 7: Salary Box Plot by Experience Level
-st.header("7. Salary Distribution by Career Level")
-
-fig7 = px.box(
-    filtered_df,
-    x='experience_level',
-    y='salary',
-    color='experience_level',
-    points='outliers',
-    title='Salary Distribution Box Plot by Career Level',
-    labels={'experience_level': 'Career Level', 'salary': 'Salary (USD)'},
-    height=600
-)
-
-fig7.update_layout(showlegend=False)
-st.plotly_chart(fig7, use_container_width=True)
-
-st.markdown("""
-**How to read this chart:**
-- Box shows the middle 50% of salaries (25th to 75th percentile)
-- Line in the box is the median
-- Whiskers show the reasonable range
-- Dots are outliers (unusually high/low salaries)
-""")
+def build_section_7(view):
+    # Boxes are drawn from quartiles and whisker ends; only the outliers are sent as points
+    level_box_stats, level_outliers = box_summary(
+        view_rows(view, ['experience_level', 'salary']), view['quantiles'][('experience_level',), 'salary'],
+        'experience_level'
+    )
+    fig7 = add_box_traces(
+        go.Figure(), level_box_stats, level_outliers, 'experience_level', 'salary', px.colors.qualitative.Plotly
+    )
+    
+    fig7.update_layout(
+        title='Salary Distribution Box Plot by Career Level',
+        xaxis_title='Career Level',
+        yaxis_title='Salary (USD)',
+        height=600,
+        showlegend=False
+    )
+    return {'fig': fig7}
 
-st.markdown("---")
+@dashboard_section(7, "7. Salary Distribution by Career Level", build=build_section_7)
+def render_section_7(view):
+    result = section_result(7, view, build_section_7)
+    show_figure(result['fig'])
+    
+    st.markdown("""
+    **How to read this chart:**
+    - Box shows the middle 50% of salaries (25th to 75th percentile)
+    - Line in the box is the median
+    - Whiskers show the reasonable range
+    - Dots are outliers (unusually high/low salaries)
+    """)
 
 # Visualization 8: Experience Requirements Distribution
-st.header("8. What Experience Do Jobs Require?")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    exp_dist = filtered_df['years_of_experience'].value_counts().sort_index().head(15)
+def build_section_8(view):
+    exp_dist = view['rollups'][('years_of_experience',)]['count'].sort_index().head(15)
     
     fig8a = go.Figure()
     fig8a.add_trace(go.Bar(
@@ -558,10 +1037,7 @@ with col1:
         height=500
     )
     
-    st.plotly_chart(fig8a, use_container_width=True)
-
-with col2:
-    exp_level_dist = filtered_df['experience_level'].value_counts()
+    exp_level_dist = experience_level_counts(view['rollups']).sort_values(ascending=False)
     
     fig8b = px.pie(
         values=exp_level_dist.values,
@@ -571,100 +1047,137 @@ with col2:
         height=500
     )
     fig8b.update_traces(textposition='inside', textinfo='percent+label+value')
-    st.plotly_chart(fig8b, use_container_width=True)
+    return {'fig_years': fig8a, 'fig_levels': fig8b}
 
-st.markdown("---")
+@dashboard_section(8, "8. What Experience Do Jobs Require?", build=build_section_8)
+def render_section_8(view):
+    result = section_result(8, view, build_section_8)
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        show_figure(result['fig_years'])
+    
+    with col2:
+        show_figure(result['fig_levels'])
 
 # Visualization 9: Salary Growth Trajectory
-st.header("9. Career Salary Growth Trajectory")
-
-# Group by years of experience and calculate percentiles
-exp_years = range(0, 16)
-salary_data = []
-
-for year in exp_years:
-    year_data = filtered_df[filtered_df['years_of_experience'] == year]['salary']
-    if len(year_data) >= 5:  # At least 5 data points
-        salary_data.append({
-            'years': year,
-            '25th': year_data.quantile(0.25),
-            '50th': year_data.quantile(0.50),
-            '75th': year_data.quantile(0.75),
-            'mean': year_data.mean(),
-            'count': len(year_data)
-        })
-
-salary_trajectory_df = pd.DataFrame(salary_data)
-
-if len(salary_trajectory_df) > 0:
-    fig9 = go.Figure()
-    
-    # Add 75th percentile
-    fig9.add_trace(go.Scatter(
-        x=salary_trajectory_df['years'],
-        y=salary_trajectory_df['75th'],
-        name='75th Percentile',
-        line=dict(color='lightblue', width=2),
-        mode='lines'
-    ))
+def build_section_9(view, trajectory_split, trajectory_years):
+    # Per-year percentiles come from the planned aggregates; a split needs one extra grouped pass for all its groups
+    if trajectory_split is None:
+        salary_trajectory_df = salary_trajectory(view['rollups'], view['quantiles'], max_years=trajectory_years)
+    else:
+        split_plan = plan_aggregations({9: trajectory_aggregations(trajectory_split)})
+        split_rows = view_rows(view, [trajectory_split] + NUMERIC_COLUMNS) if view['sketches'] is None else None
+        split_rollups, split_quantiles = run_aggregations(split_plan, view['cells'], split_rows, view['sketches'])
+        salary_trajectory_df = drop_unused_categories(
+            salary_trajectory(split_rollups, split_quantiles, trajectory_split, max_years=trajectory_years),
+            [trajectory_split]
+        )
     
-    # Add median (50th percentile)
-    fig9.add_trace(go.Scatter(
-        x=salary_trajectory_df['years'],
-        y=salary_trajectory_df['50th'],
-        name='Median (50th)',
-        line=dict(color='blue', width=3),
-        mode='lines+markers'
-    ))
+    if len(salary_trajectory_df) == 0:
+        return {'fig': None}
     
-    # Add 25th percentile
-    fig9.add_trace(go.Scatter(
-        x=salary_trajectory_df['years'],
-        y=salary_trajectory_df['25th'],
-        name='25th Percentile',
-        line=dict(color='lightblue', width=2),
-        mode='lines',
-        fill='tonexty',
-        fillcolor='rgba(173, 216, 230, 0.2)'
-    ))
+    # Outer percentiles bound the band, the middle one is the headline line
+    low_col, high_col = f'{TRAJECTORY_PERCENTILES[0]}th', f'{TRAJECTORY_PERCENTILES[-1]}th'
+    mid_col = f'{TRAJECTORY_PERCENTILES[len(TRAJECTORY_PERCENTILES) // 2]}th'
     
-    # Add mean
-    fig9.add_trace(go.Scatter(
-        x=salary_trajectory_df['years'],
-        y=salary_trajectory_df['mean'],
-        name='Average',
-        line=dict(color='red', width=2, dash='dash'),
-        mode='lines'
-    ))
+    if trajectory_split:
+        fig9 = px.line(
+            salary_trajectory_df,
+            x='years',
+            y=mid_col,
+            color=trajectory_split,
+            markers=True,
+            hover_data=['count'],
+            labels={trajectory_split: trajectory_split.replace('_', ' ').title(), mid_col: f'Median ({mid_col})'}
+        )
+    else:
+        fig9 = go.Figure()
+        
+        # Add upper percentile
+        fig9.add_trace(go.Scatter(
+            x=salary_trajectory_df['years'],
+            y=salary_trajectory_df[high_col],
+            name=f'{high_col} Percentile',
+            line=dict(color='lightblue', width=2),
+            mode='lines'
+        ))
+        
+        # Add median (middle percentile)
+        fig9.add_trace(go.Scatter(
+            x=salary_trajectory_df['years'],
+            y=salary_trajectory_df[mid_col],
+            name=f'Median ({mid_col})',
+            line=dict(color='blue', width=3),
+            mode='lines+markers'
+        ))
+        
+        # Add lower percentile
+        fig9.add_trace(go.Scatter(
+            x=salary_trajectory_df['years'],
+            y=salary_trajectory_df[low_col],
+            name=f'{low_col} Percentile',
+            line=dict(color='lightblue', width=2),
+            mode='lines',
+            fill='tonexty',
+            fillcolor='rgba(173, 216, 230, 0.2)'
+        ))
+        
+        # Add mean
+        fig9.add_trace(go.Scatter(
+            x=salary_trajectory_df['years'],
+            y=salary_trajectory_df['mean'],
+            name='Average',
+            line=dict(color='red', width=2, dash='dash'),
+            mode='lines'
+        ))
     
     fig9.update_layout(
-        title='Salary Growth Trajectory (First 15 Years)',
+        title=f'Salary Growth Trajectory (First {trajectory_years} Years)',
         xaxis_title='Years of Experience',
         yaxis_title='Salary (USD)',
         height=600,
         hovermode='x unified'
     )
+    return {'fig': fig9}
+
+@dashboard_section(9, "9. Career Salary Growth Trajectory", fragment=True)
+def render_section_9(view):
+    col1, col2 = st.columns(2)
+    with col1:
+        trajectory_split = TRAJECTORY_SPLITS.get(
+            st.selectbox("Split trajectory by", ['None'] + list(TRAJECTORY_SPLITS))
+        )
+    with col2:
+        trajectory_years = st.slider("Years of experience shown", 5, 40, TRAJECTORY_YEARS)
     
-    st.plotly_chart(fig9, use_container_width=True)
+    result = section_result(9, view, build_section_9, trajectory_split, trajectory_years)
     
-    st.markdown("""
-    **Insights from the trajectory:**
-    - Shaded area represents the middle 50% of earners
-    - Median line shows typical salary progression
-    - Steeper slopes indicate faster salary growth periods
-    """)
-else:
-    st.warning("Not enough data to generate salary trajectory for filtered dataset")
-
-st.markdown("---")
+    if result['fig'] is None:
+        st.warning("Not enough data to generate salary trajectory for filtered dataset")
+        return
+    
+    show_figure(result['fig'])
+    
+    if trajectory_split:
+        st.markdown(f"""
+        **Insights from the trajectory:**
+        - Each line is the median salary per year of experience within one group
+        - Years with fewer than {TRAJECTORY_MIN_COUNT} postings in a group are left out
+        - Steeper slopes indicate faster salary growth periods
+        """)
+    else:
+        st.markdown("""
+        **Insights from the trajectory:**
+        - Shaded area represents the middle 50% of earners
+        - Median line shows typical salary progression
+        - Steeper slopes indicate faster salary growth periods
+        """)
 
 # NEW Visualization: Job Category Distribution
-st.header("10. Job Category Distribution")
-
-col1, col2 = st.columns(2)
-
-with col1:
-    category_counts = filtered_df['job_category'].value_counts().reset_index()
+def build_section_10(view):
+    category_counts = view['rollups'][('job_category',)]['count']
+    category_counts = category_counts.sort_values(ascending=False).reset_index()
     category_counts.columns = ['Job Category', 'Count']
     
     fig_cat1 = px.pie(
@@ -676,9 +1189,7 @@ with col1:
         height=500
     )
     fig_cat1.update_traces(textposition='inside', textinfo='percent+label')
-    st.plotly_chart(fig_cat1, use_container_width=True)
-
-with col2:
+    
     fig_cat2 = px.bar(
         category_counts,
         x='Count',
@@ -690,23 +1201,25 @@ with col2:
     )
     fig_cat2.update_traces(textposition='outside')
     fig_cat2.update_layout(yaxis={'categoryorder': 'total ascending'})
-    st.plotly_chart(fig_cat2, use_container_width=True)
+    return {'fig_share': fig_cat1, 'fig_count': fig_cat2}
 
-st.markdown("---")
+@dashboard_section(10, "10. Job Category Distribution", build=build_section_10)
+def render_section_10(view):
+    result = section_result(10, view, build_section_10)
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        show_figure(result['fig_share'])
+    
+    with col2:
+        show_figure(result['fig_count'])
 
 # NEW Visualization: Salary by Job Category
-st.header("11. Salary Analysis by Job Category")
-
-category_salary = filtered_df.groupby('job_category', observed=False).agg({
-    'salary': ['mean', 'median', 'min', 'max', 'count']
-}).round(0)
-category_salary.columns = ['Average', 'Median', 'Min', 'Max', 'Count']
-category_salary = category_salary[category_salary['Count'] >= 10]  # At least 10 jobs
-category_salary = category_salary.sort_values('Median', ascending=False).reset_index()
-
-col1, col2 = st.columns([2, 1])
-
-with col1:
+def build_section_11(view):
+    category_salary = category_stats(view['rollups'], view['quantiles']).round(0)
+    category_salary.columns = ['Average', 'Median', 'Min', 'Max', 'Count']
+    category_salary = category_salary.sort_values('Median', ascending=False).reset_index()
+    
     fig_cat3 = go.Figure()
     
     fig_cat3.add_trace(go.Bar(
@@ -738,110 +1251,105 @@ with col1:
         yaxis={'categoryorder': 'total ascending'}
     )
     
-    st.plotly_chart(fig_cat3, use_container_width=True)
-
-with col2:
-    st.subheader("Salary Statistics")
-    
     # Create a styled dataframe
     display_salary_df = category_salary[['job_category', 'Median', 'Average', 'Count']].copy()
     display_salary_df.columns = ['Category', 'Median', 'Average', 'Jobs']
     display_salary_df['Median'] = display_salary_df['Median'].apply(lambda x: f'${x:,.0f}')
     display_salary_df['Average'] = display_salary_df['Average'].apply(lambda x: f'${x:,.0f}')
-    
-    st.dataframe(display_salary_df, use_container_width=True, hide_index=True, height=400)
+    return {'fig': fig_cat3, 'table': display_salary_df}
 
-st.markdown("---")
+@dashboard_section(11, "11. Salary Analysis by Job Category", build=build_section_11)
+def render_section_11(view):
+    result = section_result(11, view, build_section_11)
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        show_figure(result['fig'])
+    
+    with col2:
+        st.subheader("Salary Statistics")
+        st.dataframe(result['table'], use_container_width=True, hide_index=True, height=400)
 
 # NEW Visualization: Job Category vs Experience Requirements
-st.header("12. Experience Requirements by Job Category")
-
-category_exp = filtered_df.groupby('job_category', observed=False).agg({
-    'years_of_experience': ['mean', 'median', 'count']
-}).round(1)
-category_exp.columns = ['Avg Experience', 'Median Experience', 'Job Count']
-category_exp = category_exp[category_exp['Job Count'] >= 10]
-category_exp = category_exp.sort_values('Median Experience', ascending=False).reset_index()
-
-fig_cat4 = px.scatter(
-    category_exp,
-    x='Median Experience',
-    y='Avg Experience',
-    size='Job Count',
-    color='job_category',
-    hover_data=['Job Count'],
-    title='Experience Requirements: Median vs Average (Bubble size = Job Count)',
-    labels={'Median Experience': 'Median Years Required', 'Avg Experience': 'Average Years Required'},
-    height=600
-)
-
-# Add diagonal line
-max_exp = max(category_exp['Median Experience'].max(), category_exp['Avg Experience'].max())
-fig_cat4.add_trace(go.Scatter(
-    x=[0, max_exp],
-    y=[0, max_exp],
-    mode='lines',
-    line=dict(color='red', dash='dash'),
-    name='Equal Line',
-    showlegend=True
-))
-
-st.plotly_chart(fig_cat4, use_container_width=True)
-
-st.markdown("""
-**Insight**: Points above the diagonal line indicate categories where the average experience 
-is higher than median (influenced by high-experience outliers).
-""")
+def build_section_12(view):
+    category_exp = category_stats(view['rollups'], view['quantiles'], 'years_of_experience')
+    category_exp = category_exp[['mean', 'median', 'count']].round(1)
+    category_exp.columns = ['Avg Experience', 'Median Experience', 'Job Count']
+    category_exp = category_exp.sort_values('Median Experience', ascending=False).reset_index()
+    
+    fig_cat4 = scatter_figure(
+        drop_unused_categories(category_exp, ['job_category']),
+        'Median Experience',
+        'Avg Experience',
+        view['scatter_backend'],
+        size='Job Count',
+        color='job_category',
+        hover_data=['Job Count'],
+        title='Experience Requirements: Median vs Average (Bubble size = Job Count)',
+        labels={'Median Experience': 'Median Years Required', 'Avg Experience': 'Average Years Required'},
+        height=600
+    )
+    
+    # Add diagonal line
+    max_exp = max(category_exp['Median Experience'].max(), category_exp['Avg Experience'].max())
+    add_line_trace(
+        fig_cat4,
+        [0, max_exp],
+        [0, max_exp],
+        line=dict(color='red', dash='dash'),
+        name='Equal Line',
+        showlegend=True
+    )
+    return {'fig': fig_cat4}
 
-st.markdown("---")
+@dashboard_section(12, "12. Experience Requirements by Job Category", inputs=('filters', 'scatter_backend'),
+                   build=build_section_12)
+def render_section_12(view):
+    result = section_result(12, view, build_section_12)
+    show_figure(result['fig'])
+    
+    st.markdown("""
+    **Insight**: Points above the diagonal line indicate categories where the average experience
+    is higher than median (influenced by high-experience outliers).
+    """)
 
 # NEW Visualization: Category Salary Heatmap
-st.header("13. Salary Heatmap: Job Category vs Experience Level")
-
-# Create pivot table
-heatmap_data = filtered_df.groupby(['job_category', 'experience_level'], observed=False)['salary'].mean().reset_index()
-heatmap_pivot = heatmap_data.pivot(index='job_category', columns='experience_level', values='salary')
-
-# Filter to categories with data
-heatmap_pivot = heatmap_pivot.dropna(how='all')
-
-fig_cat5 = px.imshow(
-    heatmap_pivot,
-    labels=dict(x="Experience Level", y="Job Category", color="Avg Salary"),
-    x=heatmap_pivot.columns,
-    y=heatmap_pivot.index,
-    color_continuous_scale='RdYlGn',
-    aspect='auto',
-    title='Average Salary Heatmap by Category and Experience Level',
-    height=600
-)
-
-fig_cat5.update_xaxes(side="bottom")
-fig_cat5.update_layout(
-    xaxis_title="Experience Level",
-    yaxis_title="Job Category"
-)
-
-st.plotly_chart(fig_cat5, use_container_width=True)
+def build_section_13(view):
+    # Pivot of the categories with data against the experience levels
+    heatmap_pivot = category_level_salaries(view['rollups'])
+    
+    fig_cat5 = px.imshow(
+        heatmap_pivot,
+        labels=dict(x="Experience Level", y="Job Category", color="Avg Salary"),
+        x=heatmap_pivot.columns,
+        y=heatmap_pivot.index,
+        color_continuous_scale='RdYlGn',
+        aspect='auto',
+        title='Average Salary Heatmap by Category and Experience Level',
+        height=600
+    )
+    
+    fig_cat5.update_xaxes(side="bottom")
+    fig_cat5.update_layout(
+        xaxis_title="Experience Level",
+        yaxis_title="Job Category"
+    )
+    return {'fig': fig_cat5}
 
-st.markdown("---")
+@dashboard_section(13, "13. Salary Heatmap: Job Category vs Experience Level", build=build_section_13)
+def render_section_13(view):
+    result = section_result(13, view, build_section_13)
+    show_figure(result['fig'])
 
 # NEW Visualization: Top Companies by Job Category
-st.header("14. Top Hiring Companies by Job Category")
-
-selected_cat_for_companies = st.selectbox(
-    "Select a job category to see top hiring companies:",
-    sorted(filtered_df['job_category'].unique())
-)
-
-cat_filtered = filtered_df[filtered_df['job_category'] == selected_cat_for_companies]
-
-col1, col2 = st.columns(2)
-
-with col1:
-    st.subheader(f"Top Companies Hiring {selected_cat_for_companies}")
-    top_companies_cat = cat_filtered['company_name'].value_counts().head(15).reset_index()
-    top_companies_cat.columns = ['Company', 'Job Count']
+def build_section_14(view, selected_cat_for_companies):
+    rollups = view['rollups']
+    filtered_df = view_rows(view, ['job_category', 'salary'])
+    cat_filtered = filtered_df[filtered_df['job_category'] == selected_cat_for_companies]
+    cat_totals = rollups[('job_category',)].loc[selected_cat_for_companies]
+    
+    cat_company_stats = rollups[('job_category', 'company_name')].xs(selected_cat_for_companies, level='job_category')
+    top_companies_cat = company_leaderboards(cat_company_stats, top_n=15)[0][['Company', 'Job Count']]
     
     fig_cat6a = px.bar(
         top_companies_cat,
@@ -854,18 +1362,16 @@ with col1:
     )
     fig_cat6a.update_traces(textposition='outside', marker_color='steelblue')
     fig_cat6a.update_layout(yaxis={'categoryorder': 'total ascending'})
-    st.plotly_chart(fig_cat6a, use_container_width=True)
-
-with col2:
-    st.subheader(f"Salary Distribution for {selected_cat_for_companies}")
     
-    fig_cat6b = go.Figure()
-    fig_cat6b.add_trace(go.Box(
-        y=cat_filtered['salary'],
-        name=selected_cat_for_companies,
-        marker_color='lightblue',
-        boxmean='sd'
-    ))
+    cat_box_stats, cat_outliers = box_summary(
+        cat_filtered, view['quantiles'][('job_category',), 'salary'].loc[[selected_cat_for_companies]], 'job_category'
+    )
+    cat_box_stats['mean'] = cat_totals['salary_mean']
+    cat_box_stats['sd'] = np.sqrt((cat_totals['salary_sumsq'] - cat_totals['salary_sum'] ** 2 / cat_totals['count'])
+                                  / max(cat_totals['count'] - 1, 1))
+    fig_cat6b = add_box_traces(
+        go.Figure(), cat_box_stats, cat_outliers, 'job_category', 'salary', ['lightblue'], boxmean='sd'
+    )
     
     fig_cat6b.update_layout(
         title=f'{selected_cat_for_companies} Salary Distribution',
@@ -874,67 +1380,351 @@ with col2:
         showlegend=False
     )
     
-    st.plotly_chart(fig_cat6b, use_container_width=True)
-    
-    # Show statistics
-    st.metric("Median Salary", f"${cat_filtered['salary'].median():,.0f}")
-    st.metric("Average Salary", f"${cat_filtered['salary'].mean():,.0f}")
-    st.metric("Total Jobs", f"{len(cat_filtered):,}")
+    return {
+        'fig_companies': fig_cat6a,
+        'fig_salary': fig_cat6b,
+        'median': view['quantiles'][('job_category',), 'salary'].loc[selected_cat_for_companies, 0.5],
+        'mean': cat_totals['salary_mean'],
+        'count': int(cat_totals['count']),
+    }
 
-st.markdown("---")
+@dashboard_section(14, "14. Top Hiring Companies by Job Category", fragment=True)
+def render_section_14(view):
+    selected_cat_for_companies = st.selectbox(
+        "Select a job category to see top hiring companies:",
+        sorted(view['rollups'][('job_category',)].index)
+    )
+    result = section_result(14, view, build_section_14, selected_cat_for_companies)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.subheader(f"Top Companies Hiring {selected_cat_for_companies}")
+        show_figure(result['fig_companies'])
+    
+    with col2:
+        st.subheader(f"Salary Distribution for {selected_cat_for_companies}")
+        show_figure(result['fig_salary'])
+        
+        # Show statistics
+        st.metric("Median Salary", f"${result['median']:,.0f}")
+        st.metric("Average Salary", f"${result['mean']:,.0f}")
+        st.metric("Total Jobs", f"{result['count']:,}")
 
 # Visualization 15: Interactive Data Explorer
-st.header("15. Interactive Data Explorer")
-
-st.subheader("Customize Your Analysis")
-
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    x_axis = st.selectbox(
-        "X-axis",
-        ['years_of_experience', 'salary', 'experience_level', 'location_type', 'job_category', 'company_name'],
-        index=0
+def build_section_15(view, x_axis, y_axis, color_by):
+    color_columns = [color_by] if color_by != 'None' else []
+    hover_columns = ['job_title', 'company_name', 'location', 'salary', 'years_of_experience']
+    filtered_df = view_rows(view, [x_axis, y_axis] + color_columns + hover_columns)
+    
+    # Downsample with a fixed seed (or bin) if too many points, keeping every color group and the outliers
+    explorer_points, explorer_bins, explorer_used = downsample_scatter(
+        filtered_df, x_axis, y_axis, view['scatter_strategy'], stratify_by=color_by if color_by != 'None' else None
     )
+    plot_df = drop_unused_categories(explorer_points, [x_axis] + color_columns)
+    
+    if explorer_bins is not None:
+        fig10 = scatter_heatmap_figure(
+            explorer_bins,
+            plot_df,
+            x_axis,
+            y_axis,
+            view['scatter_backend'],
+            hover_data=hover_columns,
+            title=f'{y_axis} vs {x_axis} (job density)',
+            height=600
+        )
+    elif color_by == 'None':
+        fig10 = scatter_figure(
+            plot_df,
+            x_axis,
+            y_axis,
+            view['scatter_backend'],
+            hover_data=hover_columns,
+            title=f'{y_axis} vs {x_axis}',
+            height=600
+        )
+    else:
+        fig10 = scatter_figure(
+            plot_df,
+            x_axis,
+            y_axis,
+            view['scatter_backend'],
+            color=color_by,
+            hover_data=hover_columns,
+            title=f'{y_axis} vs {x_axis} (colored by {color_by})',
+            height=600
+        )
+    
+    return {'fig': fig10, 'caption': downsample_caption(explorer_points, explorer_bins, len(filtered_df), explorer_used)}
 
-with col2:
-    y_axis = st.selectbox(
-        "Y-axis",
-        ['salary', 'years_of_experience'],
-        index=0
+@dashboard_section(15, "15. Interactive Data Explorer",
+                   inputs=('filters', 'scatter_strategy', 'scatter_backend'), fragment=True)
+def render_section_15(view):
+    st.subheader("Customize Your Analysis")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        x_axis = st.selectbox(
+            "X-axis",
+            ['years_of_experience', 'salary', 'experience_level', 'location_type', 'job_category', 'company_name'],
+            index=0
+        )
+    
+    with col2:
+        y_axis = st.selectbox(
+            "Y-axis",
+            ['salary', 'years_of_experience'],
+            index=0
+        )
+    
+    with col3:
+        color_by = st.selectbox(
+            "Color by",
+            ['experience_level', 'salary_range', 'location_type', 'job_category', 'None'],
+            index=0
+        )
+    
+    result = section_result(15, view, build_section_15, x_axis, y_axis, color_by)
+    show_figure(result['fig'])
+    
+    if result['caption']:
+        st.caption(result['caption'])
+
+# Instrument this run if the sidebar switch (drawn below) is on; memory is traced only meanwhile
+if st.session_state.get('instrumentation'):
+    perf_log = []
+    start_memory_trace()
+run_started = perf_start()
+
+# The rest of the run ends the memory trace however it ends, including reruns and errors
+try:
+    # Load the data, merging in the lines appended to the CSV when the refresh button (drawn below) was pressed
+    started = perf_start()
+    dataset = current_dataset(refresh=st.session_state.get('refresh_data', False))
+    df = load_data()
+    perf_record(started, 'load_data', 'load')
+    
+    # Sidebar filters
+    st.sidebar.title("Filters")
+    
+    filter_choices = load_filter_choices(dataset['version'])
+    
+    if df.attrs.get('rejected_rows'):
+        st.sidebar.warning(f"Skipped {df.attrs['rejected_rows']:,} malformed rows "
+                           f"(see {rejected_rows_path(DATA_PATH)})")
+    
+    # Experience filter
+    exp_range = st.sidebar.slider(
+        "Years of Experience",
+        min_value=filter_choices['years_of_experience'][0],
+        max_value=filter_choices['years_of_experience'][1],
+        value=filter_choices['years_of_experience']
     )
-
-with col3:
-    color_by = st.selectbox(
-        "Color by",
-        ['experience_level', 'salary_range', 'location_type', 'job_category', 'None'],
-        index=0
+    
+    # Salary filter
+    salary_range = st.sidebar.slider(
+        "Salary Range (USD)",
+        min_value=filter_choices['salary'][0],
+        max_value=filter_choices['salary'][1],
+        value=filter_choices['salary'],
+        step=SALARY_SLIDER_STEP,
+        format="$%d"
     )
-
-# Sample data if too many points
-plot_df = filtered_df.sample(min(5000, len(filtered_df))) if len(filtered_df) > 5000 else filtered_df
-
-if color_by == 'None':
-    fig10 = px.scatter(
-        plot_df,
-        x=x_axis,
-        y=y_axis,
-        hover_data=['job_title', 'company_name', 'location', 'salary', 'years_of_experience'],
-        title=f'{y_axis} vs {x_axis}',
-        height=600
+    
+    # Location type filter
+    location_types = ['All'] + filter_choices['location_type']
+    selected_location_type = st.sidebar.selectbox("Location Type", location_types)
+    
+    # City filter
+    top_cities = ['All'] + filter_choices['city']
+    selected_city = st.sidebar.selectbox("City (Top 50)", top_cities)
+    
+    # Company filter
+    top_companies = ['All'] + filter_choices['company_name']
+    selected_company = st.sidebar.selectbox("Company (Top 50)", top_companies)
+    
+    # Job category filter
+    job_categories = ['All'] + filter_choices['job_category']
+    selected_category = st.sidebar.selectbox("Job Category", job_categories)
+    
+    # Quantile mode: streaming keeps no salaries to sort, so its quantiles always come from the sketches
+    approximate_quantiles = dataset['mode'] == 'stream' or st.sidebar.toggle(
+        "Approximate quantiles",
+        help="Merge per-cell salary sketches instead of sorting the filtered salaries"
     )
-else:
-    fig10 = px.scatter(
-        plot_df,
-        x=x_axis,
-        y=y_axis,
-        color=color_by,
-        hover_data=['job_title', 'company_name', 'location', 'salary', 'years_of_experience'],
-        title=f'{y_axis} vs {x_axis} (colored by {color_by})',
-        height=600
+    quantile_error = None
+    if dataset['mode'] == 'stream':
+        quantile_error = STREAM_QUANTILE_ERROR
+    elif approximate_quantiles:
+        quantile_error = st.sidebar.select_slider(
+            "Quantile error bound (±%)",
+            options=QUANTILE_ERROR_OPTIONS,
+            value=1
+        ) / 100
+    
+    # Scatter downsampling
+    scatter_strategy = st.sidebar.selectbox(
+        "Scatter rendering",
+        SCATTER_STRATEGIES,
+        help=f"Scatters with more than {SCATTER_MAX_POINTS:,} jobs are sampled with a fixed seed or binned "
+             f"into a heatmap; 'Auto' samples up to {SCATTER_HEATMAP_ROWS:,} jobs"
     )
-
-st.plotly_chart(fig10, use_container_width=True)
+    
+    scatter_backend = st.sidebar.selectbox(
+        "Scatter backend",
+        SCATTER_BACKENDS,
+        help=f"WebGL draws large scatters much faster than SVG; 'Auto' switches to WebGL above "
+             f"{WEBGL_POINT_THRESHOLD:,} points"
+    )
+    
+    # Lazy sections
+    lazy_sections = st.sidebar.toggle(
+        "Lazy sections",
+        help="Collapse every section and compute it only once it is opened"
+    )
+    
+    # Section workers
+    section_workers = st.sidebar.slider(
+        "Section workers", 1, MAX_SECTION_WORKERS, SECTION_WORKERS,
+        help="Threads that build independent sections concurrently; 1 builds them one at a time"
+    )
+    
+    # Performance instrumentation
+    st.sidebar.toggle(
+        "Performance instrumentation",
+        key='instrumentation',
+        help="Time each step of a rerun and show it in a debug panel at the bottom of the sidebar. "
+             "Memory tracing slows instrumented runs down"
+    )
+    
+    # Memory used per column, compared to untyped object/float64 columns
+    with st.sidebar.expander("Dataset Memory"):
+        st.dataframe(load_memory_report(dataset['version']), use_container_width=True, hide_index=True)
+    
+    # Data refresh
+    st.sidebar.button(
+        "Refresh data",
+        key='refresh_data',
+        help="Parse only the lines appended to the CSV since it was loaded and merge them in; "
+             "a rewritten CSV is reloaded from scratch"
+    )
+    appended_bytes = os.path.getsize(DATA_PATH) - dataset['size']
+    if appended_bytes > 0:
+        st.sidebar.caption(f"{appended_bytes:,} bytes were appended to the CSV since it was loaded")
+    
+    # Filter state: the filtered rows and aggregates are rebuilt only when it changes
+    active_ranges = {'years_of_experience': exp_range, 'salary': salary_range}
+    selected_categories = {
+        'location_type': selected_location_type,
+        'city': selected_city,
+        'company_name': selected_company,
+        'job_category': selected_category,
+    }
+    active_categories = {col: value for col, value in selected_categories.items() if value != 'All'}
+    filter_state = (dataset['version'], tuple(active_ranges.items()), tuple(sorted(active_categories.items())),
+                    quantile_error)
+    
+    # In lazy mode only the headline metrics and the opened sections are aggregated
+    opened_sections = None
+    if lazy_sections:
+        opened_sections = tuple(key for key in SECTION_AGGREGATIONS
+                                if key != 'metrics' and st.session_state.get(f'open_section_{key}'))
+    
+    view = cached_step('filters', filter_state, filter_view, active_ranges, active_categories, quantile_error)
+    view = dict(
+        view,
+        **cached_step('aggregates', (filter_state, opened_sections), aggregate_view, view, opened_sections),
+        filters=filter_state,
+        scatter_strategy=scatter_strategy,
+        scatter_backend=scatter_backend,
+    )
+    rollups, quantiles, totals = view['rollups'], view['quantiles'], view['totals']
+    company_stats = rollups[('company_name',)]
+    
+    # Main title
+    st.title("LinkedIn Jobs Market Analytics Dashboard")
+    jobs_shown = f"about **{view['n_rows']:,}**" if view['estimated'] else f"**{view['n_rows']:,}**"
+    st.markdown(f"Analyzing {jobs_shown} jobs from a dataset of **{filter_choices['total_rows']:,}** total positions")
+    st.markdown("**15 Interactive Visualizations** | Filter data using sidebar controls")
+    if dataset['mode'] == 'stream':
+        st.caption(f"Streaming ingestion: metrics and aggregate charts cover every job; scatter points, histograms "
+                   f"and outliers are drawn from a uniform sample of {len(df):,}, as is everything once a city or "
+                   f"company is selected. Company rankings count the most frequent companies' postings, and are "
+                   f"estimated from the sample under other filters")
+    if view['estimated']:
+        st.caption("Job counts are estimates: each sampled job stands for the postings it was drawn from, "
+                   "scaled to the selected company's or city's count where it is among the most frequent")
+    if view['sketches'] is not None:
+        st.caption(f"Medians and percentiles are approximate: each is within ±{quantile_error:.1%} of an actual salary")
+    
+    # Key metrics
+    col1, col2, col3, col4, col5 = st.columns(5)
+    
+    with col1:
+        st.metric("Total Jobs (est.)" if view['estimated'] else "Total Jobs", f"{view['n_rows']:,}")
+    
+    with col2:
+        median_salary = quantiles[(), 'salary'].loc[0, 0.5]
+        st.metric("Median Salary", f"${median_salary:,.0f}")
+    
+    with col3:
+        st.metric("Avg Salary", f"${totals['salary_mean']:,.0f}")
+    
+    with col4:
+        st.metric("Avg Experience", f"{totals['years_mean']:.1f} yrs")
+    
+    with col5:
+        st.metric("Top Company", company_stats['count'].idxmax() if view['n_rows'] > 0 else "N/A")
+    
+    st.markdown("---")
+    
+    # Start building the shown sections on the pool, then render them in order as their results arrive
+    shown_sections = [number for number in sorted(SECTIONS)
+                      if not lazy_sections or st.session_state.get(f'open_section_{number}')]
+    
+    view['scheduled'] = schedule_sections(view, shown_sections, section_workers)
+    
+    # Render the sections in order; lazy sections stay closed (and uncomputed) until toggled open
+    for number in sorted(SECTIONS):
+        section = SECTIONS[number]
+        if lazy_sections:
+            with st.container(border=True):
+                if st.toggle(section['title'], key=f'open_section_{number}'):
+                    section['render'](view)
+            continue
+        
+        if number > 1:
+            st.markdown("---")
+        st.header(section['title'])
+        section['render'](view)
+    
+    # Shared cache usage, shown last so it includes this run's lookups
+    with st.sidebar.expander("Result Cache"):
+        cache_stats = pd.DataFrame({'Results': result_cache_stats(), 'Figures': result_cache_stats('figures')})
+        st.dataframe(cache_stats.astype(str), use_container_width=True)
+    
+    # Performance of this run, plus earlier instrumented runs of the session for export
+    if perf_log is not None:
+        perf_record(run_started, 'rerun', 'run')
+        run_id = time.strftime('%Y-%m-%dT%H:%M:%S')
+        history = st.session_state.setdefault('perf_history', collections.deque(maxlen=PERF_HISTORY_RUNS))
+        history.append([dict(record, run=run_id) for record in perf_log])
+        with st.sidebar.expander("Performance", expanded=True):
+            lookups = [record['cache'] for record in perf_log if 'cache' in record]
+            st.caption(f"Rerun took {perf_log[-1]['ms']:,.0f} ms: {lookups.count('hit')} cache hits, "
+                       f"{lookups.count('miss')} misses")
+            st.dataframe(pd.DataFrame(perf_log), use_container_width=True, hide_index=True)
+            st.download_button(
+                f"Download {len(history)} runs as JSON lines",
+                '\n'.join(json.dumps(record) for run in history for record in run),
+                file_name='dashboard_performance.jsonl',
+                mime='application/jsonl',
+            )
+finally:
+    if perf_log is not None:
+        stop_memory_trace()
 
 # Footer
 st.markdown("---")
@@ -945,4 +1735,3 @@ st.markdown("""
     <p>Built with Streamlit and Plotly</p>
 </div>
 """, unsafe_allow_html=True)
-
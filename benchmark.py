@@ -0,0 +1,157 @@
+"""Benchmark the dashboard's data pipeline on synthetic exports of growing size.
+
+For each scale (a multiple of the real export's rows) a synthetic CSV is generated once under
+data/synthetic/, then every stage is timed on it: parsing, enrichment, the on-disk cache, the
+startup indexes, a set of sidebar filters, each section's aggregations and streaming ingestion.
+Each stage is written as one JSON line with its wall time, peak traced memory and rows per second,
+so runs can be compared with any JSON tool. Stages run twice, once timed and once traced, since
+timings taken under tracemalloc are inflated.
+
+    python benchmark.py --scales 1 10 100 --output bench.jsonl
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import analytics
+import synthetic_data
+
+DEFAULT_SCALES = [1, 10, 100]
+SYNTHETIC_DIR = os.path.join('data', 'synthetic')
+
+# Sidebar filter states timed by the 'filter' stages: (ranges, categories)
+FILTER_SCENARIOS = {
+    'salary band': ({'salary': (150000, 250000)}, {}),
+    'remote': ({}, {'location_type': 'Remote'}),
+    'city and experience': ({'years_of_experience': (3, 10)}, {'city': 'Seattle, WA'}),
+    'uneven salary bound': ({'salary': (123456, 400000)}, {'job_category': 'Data Scientist'}),
+}
+
+# Work sections do besides their planned aggregations, on rows or on the aggregates: (rows, rollups, quantiles) -> result
+SECTION_ROW_WORK = {
+    1: lambda rows, rollups, quantiles: analytics.downsample_scatter(
+        rows, 'years_of_experience', 'salary', stratify_by='experience_level'),
+    4: lambda rows, rollups, quantiles: analytics.histogram_bins(rows['salary']),
+    2: lambda rows, rollups, quantiles: analytics.experience_level_stats(rollups, quantiles),
+    5: lambda rows, rollups, quantiles: analytics.top_states(rollups, quantiles),
+    7: lambda rows, rollups, quantiles: analytics.box_summary(
+        rows, quantiles[('experience_level',), 'salary'], 'experience_level'),
+    9: lambda rows, rollups, quantiles: analytics.salary_trajectory(rollups, quantiles),
+    11: lambda rows, rollups, quantiles: analytics.category_stats(rollups, quantiles),
+    13: lambda rows, rollups, quantiles: analytics.category_level_salaries(rollups),
+}
+
+# Function to time one stage
+def measure(records, stage, n_rows, fn, *args):
+    """Run `fn(*args)` and append its wall time, peak traced memory and throughput to `records`.
+    
+    The stage is timed untraced, since tracemalloc slows allocation-heavy code down severalfold, then
+    run once more under tracemalloc for its peak memory: Python objects and NumPy/pandas buffers.
+    Arrow allocates outside of it, so `arrow_mb` reports the Arrow memory the timed run left
+    allocated instead. Returns the timed run's result.
+    """
+    arrow_before = pa.total_allocated_bytes()
+    start = time.perf_counter()
+    result = fn(*args)
+    wall = time.perf_counter() - start
+    arrow_mb = (pa.total_allocated_bytes() - arrow_before) / 2 ** 20
+    
+    tracemalloc.start()
+    try:
+        fn(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    records.append({
+        'stage': stage,
+        'rows': n_rows,
+        'wall_s': round(wall, 6),
+        'peak_mb': round(peak / 2 ** 20, 3),
+        'arrow_mb': round(arrow_mb, 3),
+        'rows_per_s': round(n_rows / wall) if n_rows and wall > 0 else None,
+    })
+    return result
+
+# Function to generate (or reuse) the synthetic export for a scale
+def synthetic_csv(scale, seed=synthetic_data.SYNTHETIC_SEED):
+    """Path of the synthetic export for `scale`, written on first use"""
+    path = os.path.join(SYNTHETIC_DIR, f'jobs_{scale:g}x_seed{seed}.csv')
+    if not os.path.exists(path):
+        synthetic_data.write_jobs_csv(path, int(synthetic_data.BASE_ROWS * scale), seed)
+    return path
+
+# Function to benchmark every stage at one scale
+def benchmark_scale(path):
+    """Stage records for the export at `path`"""
+    records = []
+    df, rejected = measure(records, 'parse', None, analytics.read_jobs_csv, path)
+    n_rows = len(df)
+    records[-1].update(rows=n_rows, rows_per_s=round(n_rows / records[-1]['wall_s']))
+    
+    df = measure(records, 'enrich', n_rows, analytics.enrich_data, df)
+    measure(records, 'cache write', n_rows, analytics.write_enriched_cache, path, df)
+    mapped = measure(records, 'cache map', n_rows, analytics.read_enriched_cache, path)
+    if mapped is not None:
+        df = mapped
+    
+    index = measure(records, 'filter index', n_rows, analytics.build_filter_index, df)
+    cube = measure(records, 'cube', n_rows, analytics.build_cube, df)
+    key_rollups = measure(records, 'key rollups', n_rows, analytics.build_key_rollups, df)
+    measure(records, 'salary sketches', n_rows, analytics.build_salary_sketches, df, 0.01)
+    
+    for name, (ranges, categories) in FILTER_SCENARIOS.items():
+        measure(records, f'filter: {name}', n_rows, analytics.filter_rows, index, ranges, categories)
+    
+    # Sections over all rows, with exact quantiles as the dashboard computes them by default
+    for key in analytics.SECTION_AGGREGATIONS:
+        plan = analytics.aggregation_plan(() if key == 'metrics' else (key,))
+        stage = 'metrics' if key == 'metrics' else f'section {key}'
+        rollups, quantiles = measure(records, stage, n_rows, analytics.run_aggregations, plan, cube, df,
+                                     None, key_rollups)
+        if key in SECTION_ROW_WORK:
+            measure(records, f'{stage} rows', n_rows, SECTION_ROW_WORK[key], df, rollups, quantiles)
+    
+    # The same export streamed in chunks: its peak memory should stay flat across scales
+    measure(records, 'streaming ingest', n_rows, analytics.stream_aggregates, path)
+    return records
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=float, nargs='+', default=DEFAULT_SCALES,
+                        help='multiples of the real export to benchmark (default 1 10 100; 1000 needs '
+                             'about 4 GB of disk and several times that in memory)')
+    parser.add_argument('--seed', type=int, default=synthetic_data.SYNTHETIC_SEED)
+    parser.add_argument('--output', help='append JSON lines here instead of printing them')
+    args = parser.parse_args()
+    
+    run = {
+        'run': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'pyarrow': pa.__version__,
+        'cpus': os.cpu_count(),
+    }
+    out = open(args.output, 'a') if args.output else sys.stdout
+    try:
+        for scale in args.scales:
+            path = synthetic_csv(scale, args.seed)
+            for record in benchmark_scale(path):
+                out.write(json.dumps({**run, 'scale': scale, **record}) + '\n')
+                out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+if __name__ == '__main__':
+    main()
@@ -40,7 +40,7 @@ read
 # Add files
 echo ""
 echo "Adding files to git..."
-git add app.py requirements.txt README.md DEPLOYMENT_GUIDE.md data/linkedin_jobs.csv .gitignore
+git add app.py analytics.py requirements.txt README.md DEPLOYMENT_GUIDE.md data/linkedin_jobs.csv .gitignore
 
 # Commit
 echo ""
@@ -0,0 +1,175 @@
+"""Synthetic LinkedIn jobs exports for load testing.
+
+Generates CSVs with the same columns and formats as data/linkedin_jobs.csv at any multiple of its
+37,955 rows: a long-tailed company distribution, job titles covering every job category rule,
+every location format (plain, Remote/Hybrid/On-site, metro areas, country-wide and bare company
+names) and salaries that rise with experience.
+
+    python synthetic_data.py --scale 100 --output data/synthetic/jobs_100x.csv
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# Rows in the real export; --scale multiplies it
+BASE_ROWS = 37955
+SYNTHETIC_SEED = 7
+# Rows generated and written per chunk, so any scale fits in memory
+CHUNK_ROWS = 500000
+
+# Job title stems per category, with each category's share of postings in the real export. Every
+# stem is classified into its category by analytics.JOB_CATEGORY_RULES ('Other' matches no rule)
+TITLE_STEMS = {
+    'Data Scientist': (0.676, ['Data Scientist', 'Data Science Lead', 'Data Scientist, Machine Learning']),
+    'ML/AI Engineer': (0.143, ['Machine Learning Engineer', 'ML Engineer', 'AI Engineer', 'Applied Scientist',
+                               'ML Scientist', 'AI Architect']),
+    'Data Engineer': (0.025, ['Data Engineer', 'Data Infrastructure Engineer', 'Data Platform Engineer']),
+    'Data Analyst': (0.035, ['Data Analyst', 'Business Analyst', 'Analytics Engineer']),
+    'Research Scientist': (0.009, ['Research Scientist', 'Quantitative Researcher']),
+    'Product/Decision Scientist': (0.002, ['Product Scientist', 'Decision Scientist']),
+    'Statistician': (0.001, ['Statistician', 'Biostatistician']),
+    'Manager/Lead': (0.018, ['Engineering Manager', 'Director of Data', 'Head of Insights', 'VP, Data',
+                             'Chief Data Officer']),
+    'Other': (0.091, ['Software Engineer', 'Quantitative Developer', 'Solutions Consultant', 'Actuary',
+                      'Economist']),
+}
+TITLE_PREFIXES = (['', 'Senior ', 'Sr. ', 'Staff ', 'Principal ', 'Lead ', 'Junior '],
+                  [0.35, 0.3, 0.05, 0.1, 0.08, 0.07, 0.05])
+TITLE_SUFFIXES = (['', ', Growth', ', Ads', ', Search', ', Payments', ' II', ' III'],
+                  [0.7, 0.06, 0.05, 0.05, 0.04, 0.06, 0.04])
+
+# Median salary at zero years of experience per category, and the raise per year (up to SALARY_RAISE_YEARS)
+BASE_SALARIES = {
+    'Data Scientist': 150000, 'ML/AI Engineer': 165000, 'Data Engineer': 140000, 'Data Analyst': 105000,
+    'Research Scientist': 160000, 'Product/Decision Scientist': 150000, 'Statistician': 110000,
+    'Manager/Lead': 175000, 'Other': 130000,
+}
+SALARY_RAISE = 0.035
+SALARY_RAISE_YEARS = 12
+SALARY_SPREAD = 0.25
+
+# Postings per years of experience in the real export
+EXPERIENCE_COUNTS = {
+    0: 152, 1: 4670, 2: 5491, 3: 8223, 4: 3248, 5: 9168, 6: 1688, 7: 1500, 8: 1866, 9: 54, 10: 1315,
+    11: 36, 12: 191, 13: 39, 14: 49, 15: 125, 16: 25, 18: 54, 20: 2, 21: 7, 23: 6, 25: 2, 30: 2, 40: 41,
+}
+
+# Cities with state codes, most posted first
+CITIES = [
+    ('Seattle', 'WA'), ('San Jose', 'CA'), ('New York', 'NY'), ('Bellevue', 'WA'), ('Redmond', 'WA'),
+    ('San Francisco', 'CA'), ('Los Angeles', 'CA'), ('Mountain View', 'CA'), ('Sunnyvale', 'CA'),
+    ('Boston', 'MA'), ('Cambridge', 'MA'), ('Austin', 'TX'), ('Chicago', 'IL'), ('Washington', 'DC'),
+    ('Arlington', 'VA'), ('Atlanta', 'GA'), ('Denver', 'CO'), ('Dallas', 'TX'), ('San Diego', 'CA'),
+    ('Menlo Park', 'CA'), ('Raleigh', 'NC'), ('Pittsburgh', 'PA'), ('Philadelphia', 'PA'),
+    ('Minneapolis', 'MN'), ('Salt Lake City', 'UT'), ('Portland', 'OR'), ('Phoenix', 'AZ'),
+    ('Miami', 'FL'), ('Columbus', 'OH'), ('Detroit', 'MI'),
+]
+METRO_AREAS = ['Greater Seattle Area', 'San Francisco Bay Area', 'New York City Metropolitan Area',
+               'Portland, Oregon Metropolitan Area', 'Greater Boston', 'Dallas-Fort Worth Metroplex']
+# Location formats and their shares: 'City, ST', 'City, ST (Type)', 'Company · City, ST (Type)',
+# 'United States (Remote)', metro areas and bare company names (the last three have no state)
+LOCATION_FORMATS = (['plain', 'typed', 'company typed', 'country', 'metro', 'company'],
+                    [0.25, 0.36, 0.07, 0.05, 0.1, 0.17])
+LOCATION_TYPE_SHARES = (['Remote', 'Hybrid', 'On-site'], [0.18, 0.46, 0.36])
+
+COMPANY_WORDS = (['Blue', 'North', 'Bright', 'Quantum', 'Silver', 'Vector', 'Summit', 'Pioneer', 'Nimbus',
+                  'Harbor', 'Atlas', 'Cedar', 'Signal', 'Orbit', 'Granite', 'Lumen', 'Apex', 'Meridian'],
+                 ['Labs', 'Health', 'Analytics', 'Systems', 'Capital', 'Bio', 'Networks', 'Robotics',
+                  'Media', 'Logistics', 'Energy', 'Retail', 'Insurance', 'Software', 'Games', 'Foods'])
+# Company popularity falls off as a power of its rank; the number of companies grows with the square
+# root of the rows
+COMPANY_RANK_EXPONENT = 0.85
+
+# Function to draw from a list with given shares
+def choose(rng, values, weights, size):
+    """`size` values drawn with probabilities proportional to `weights`"""
+    weights = np.asarray(weights, dtype='float64')
+    return np.asarray(values, dtype=object)[rng.choice(len(values), size=size, p=weights / weights.sum())]
+
+# Function to name the synthetic companies
+def company_names(n_companies):
+    """`n_companies` distinct names, reusing the word pairs with a number once they run out"""
+    first, second = COMPANY_WORDS
+    pairs = [f'{a} {b}' for a in first for b in second]
+    return [pairs[i % len(pairs)] + (f' {i // len(pairs) + 1}' if i >= len(pairs) else '')
+            for i in range(n_companies)]
+
+# Function to generate synthetic postings
+def generate_jobs(n_rows, seed=SYNTHETIC_SEED, companies=None):
+    """`n_rows` postings with the export's columns. `companies` is the name list to draw from, most
+    frequent first (sized for `n_rows` when None)
+    """
+    rng = np.random.default_rng(seed)
+    if companies is None:
+        companies = company_names(max(1, int(2690 * np.sqrt(n_rows / BASE_ROWS))))
+    
+    # Titles: the category first, then a stem of it with a seniority prefix and a team suffix
+    categories = list(TITLE_STEMS)
+    category = choose(rng, categories, [TITLE_STEMS[c][0] for c in categories], n_rows)
+    stems = np.empty(n_rows, dtype=object)
+    for name in categories:
+        rows = np.flatnonzero(category == name)
+        stems[rows] = choose(rng, TITLE_STEMS[name][1], np.ones(len(TITLE_STEMS[name][1])), len(rows))
+    titles = choose(rng, *TITLE_PREFIXES, n_rows) + stems + choose(rng, *TITLE_SUFFIXES, n_rows)
+    
+    # Companies: a few post many of the jobs, most post one or two
+    company = choose(rng, companies, np.arange(1, len(companies) + 1) ** -COMPANY_RANK_EXPONENT, n_rows)
+    
+    # Locations in every format the location parser handles
+    city_weights = 1 / np.arange(1, len(CITIES) + 1)
+    cities = np.array([f'{city}, {state}' for city, state in CITIES], dtype=object)
+    city = choose(rng, cities, city_weights, n_rows)
+    work_type = choose(rng, *LOCATION_TYPE_SHARES, n_rows)
+    location_format = choose(rng, *LOCATION_FORMATS, n_rows)
+    location = np.where(location_format == 'plain', city, city + ' (' + work_type + ')')
+    location = np.where(location_format == 'company typed', company + ' · ' + location, location)
+    location = np.where(location_format == 'country', 'United States (Remote)', location)
+    location = np.where(location_format == 'metro', choose(rng, METRO_AREAS, np.ones(len(METRO_AREAS)), n_rows),
+                        location)
+    location = np.where(location_format == 'company', company, location)
+    
+    # Experience from the export's distribution; salary rises with it and varies by category
+    years = choose(rng, list(EXPERIENCE_COUNTS), list(EXPERIENCE_COUNTS.values()), n_rows).astype('float64')
+    base = pd.Series(category).map(BASE_SALARIES).to_numpy(dtype='float64')
+    raise_factor = 1 + SALARY_RAISE * np.minimum(years, SALARY_RAISE_YEARS)
+    salary = base * raise_factor * rng.lognormal(0, SALARY_SPREAD, n_rows)
+    salary = np.clip(np.round(salary / 50) * 50, 20000, 950000)
+    
+    return pd.DataFrame({
+        'job_title': titles,
+        'company_name': company,
+        'location': location,
+        'salary': salary,
+        'years_of_experience': years,
+    })
+
+# Function to write a synthetic export
+def write_jobs_csv(path, n_rows, seed=SYNTHETIC_SEED, chunk_rows=CHUNK_ROWS):
+    """Write `n_rows` synthetic postings to `path` in chunks; the same seed gives the same file"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    companies = company_names(max(1, int(2690 * np.sqrt(n_rows / BASE_ROWS))))
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', newline='') as f:
+        for i, start in enumerate(range(0, n_rows, chunk_rows)):
+            chunk = generate_jobs(min(chunk_rows, n_rows - start), seed=(seed, i), companies=companies)
+            chunk.to_csv(f, header=(i == 0), index=False)
+    os.replace(tmp_path, path)
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', type=float, default=10, help='multiple of the real export size (default 10)')
+    parser.add_argument('--rows', type=int, help='exact row count (overrides --scale)')
+    parser.add_argument('--seed', type=int, default=SYNTHETIC_SEED)
+    parser.add_argument('--output', help='CSV path (default data/synthetic/jobs_<scale>x.csv)')
+    args = parser.parse_args()
+    
+    n_rows = args.rows or int(BASE_ROWS * args.scale)
+    output = args.output or os.path.join('data', 'synthetic', f'jobs_{args.scale:g}x.csv')
+    write_jobs_csv(output, n_rows, args.seed)
+    print(f'Wrote {n_rows:,} rows to {output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,195 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import analytics
+import synthetic_data
+
+JOBS_CSV = b'''job_title,company_name,location,salary,years_of_experience
+Data Scientist,Google,"New York, NY",180000.0,5.0
+Data Analyst,Google,"New York, NY",120000.0,2.0
+Machine Learning Engineer,Google,United States (Remote),210000.0,8.0
+Data Scientist,Google,United States (Remote),150000.0,3.0
+'''
+
+# Function to read and enrich the sample export
+def sample_jobs():
+    """Enriched jobs parsed from JOBS_CSV"""
+    df, rejected = analytics.read_jobs_csv(pa.py_buffer(JOBS_CSV))
+    assert rejected.empty
+    return analytics.enrich_data(df)
+
+def test_group_stats_median_per_group():
+    rollups, quantiles = analytics.compute_aggregations(sample_jobs())
+    stats = analytics.group_stats(rollups, quantiles, 'state')
+    assert stats.loc['NY', 'median'] == 150000
+    assert stats.loc['NY', 'count'] == 2
+
+def test_group_stats_without_groups():
+    # Remote jobs have no state, so the state grouping is empty
+    df = sample_jobs()
+    remote = analytics.filter_jobs(df, {}, {'location_type': 'Remote'})
+    rollups, quantiles = analytics.compute_aggregations(remote)
+    stats = analytics.group_stats(rollups, quantiles, 'state')
+    assert stats.empty
+    assert list(stats.columns) == ['mean', 'median', 'min', 'max', 'count']
+
+def test_heavy_hitters_bound_counts():
+    df = sample_jobs().assign(company_name='Google')
+    google = analytics.partial_aggregates(df, ['company_name']).astype({'company_name': object})
+    table = {}
+    for name in ['Google', 'Meta', 'Google', 'Netflix', 'Netflix']:
+        chunk = google.assign(company_name=name).set_index('company_name')
+        analytics.fold_heavy_hitters(table, chunk, capacity=2)
+    
+    top = analytics.heavy_hitter_groups(table, ('company_name',)).set_index('company_name')
+    assert list(top.index) == ['Google', 'Netflix']
+    assert top.loc['Google', 'count'] == 8
+    assert top.loc['Google', 'error'] == 0
+    # Netflix's first rows were dropped with it, so its error covers them
+    assert top.loc['Netflix', 'count'] == 4
+    assert top.loc['Netflix', 'error'] == 4
+
+def test_experience_level_stats_keep_empty_levels():
+    rollups, quantiles = analytics.compute_aggregations(sample_jobs())
+    stats = analytics.experience_level_stats(rollups, quantiles)
+    assert list(stats.index) == analytics.EXPERIENCE_LABELS
+    assert stats.loc['Expert (10+)', 'count'] == 0
+    assert stats.loc['Mid (3-5)', 'count'] == 2
+
+def test_salary_sketches_within_relative_error(tmp_path):
+    path = synthetic_data.write_jobs_csv(str(tmp_path / 'jobs.csv'), 20000)
+    df, rejected = analytics.read_jobs_csv(path)
+    df = analytics.enrich_data(df)
+    cube, key_rollups = analytics.build_cube(df), analytics.build_key_rollups(df)
+    relative_error = 0.01
+    sketches = analytics.build_salary_sketches(df, relative_error)
+    
+    # All jobs, and a filter on slider stops that the cube answers
+    low = int(df['salary'].min()) + 50000
+    for ranges, categories in [({}, {}), ({'salary': (low, low + 100000)}, {'location_type': 'Remote'})]:
+        cells = analytics.select_cube_cells(cube, ranges, categories)
+        _, approximate = analytics.run_aggregations(analytics.aggregation_plan(), cells, None,
+                                                    analytics.select_sketches(sketches, cells), key_rollups)
+        _, exact = analytics.compute_aggregations(analytics.filter_jobs(df, ranges, categories))
+        for key in exact:
+            if key[1] == 'salary':
+                estimate = approximate[key].reindex(exact[key].index)
+                assert (np.abs(estimate - exact[key]) <= relative_error * exact[key] + 1e-6).all().all()
+
+# Function to read and enrich a whole export
+def parse_jobs(path):
+    """Enriched jobs parsed from the CSV at `path`, without the cache"""
+    df, _ = analytics.read_jobs_csv(path)
+    return analytics.enrich_data(df)
+
+# Function to split a synthetic export into a prefix and the lines appended after it
+def write_split_export(tmp_path, n_rows, n_prefix):
+    """Path to a CSV holding the header and first `n_prefix` rows of a synthetic export of
+    `n_rows`, and the bytes of the remaining rows
+    """
+    full = synthetic_data.write_jobs_csv(str(tmp_path / 'full.csv'), n_rows)
+    with open(full, 'rb') as f:
+        lines = f.readlines()
+    path = tmp_path / 'jobs.csv'
+    path.write_bytes(b''.join(lines[:n_prefix + 1]))
+    return str(path), b''.join(lines[n_prefix + 1:])
+
+def test_filter_rows_match_masks(tmp_path):
+    df = parse_jobs(synthetic_data.write_jobs_csv(str(tmp_path / 'jobs.csv'), 5000))
+    index = analytics.build_filter_index(df)
+    city = df['city'].value_counts().index[0]
+    company = df['company_name'].value_counts().index[0]
+    low = int(df['salary'].median())
+    scenarios = [
+        ({}, {}),
+        ({'salary': (low, low + 50000)}, {}),
+        ({'years_of_experience': (3, 5)}, {'location_type': 'Remote'}),
+        ({'salary': (low, low + 80000), 'years_of_experience': (0, 10)}, {'city': city, 'job_category': 'ML/AI Engineer'}),
+        ({}, {'company_name': company}),
+        ({}, {'company_name': 'No Such Company'}),
+    ]
+    for ranges, categories in scenarios:
+        expected = analytics.filter_jobs(df, ranges, categories)
+        pd.testing.assert_frame_equal(analytics.filter_jobs(df, ranges, categories, index), expected)
+
+def test_appended_rows_extend_like_a_rebuild(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics, 'CACHE_DIR', str(tmp_path / 'cache'))
+    path, tail = write_split_export(tmp_path, 6000, 4000)
+    jobs, appended = analytics.refresh_jobs(path)
+    assert appended is None
+    index, cube, key_rollups = (analytics.build_filter_index(jobs), analytics.build_cube(jobs),
+                                analytics.build_key_rollups(jobs))
+    
+    with open(path, 'ab') as f:
+        f.write(tail)
+    jobs, appended = analytics.refresh_jobs(path)
+    assert len(appended) == 2000
+    pd.testing.assert_frame_equal(jobs, parse_jobs(path))
+    
+    extended, rebuilt = analytics.extend_filter_index(index, jobs), analytics.build_filter_index(jobs)
+    for kind in ['ranges', 'categories']:
+        for col, entry in rebuilt[kind].items():
+            for key, value in entry.items():
+                np.testing.assert_array_equal(extended[kind][col][key], value)
+    
+    # Cells and groups may come out in another order; their contents must match
+    def same_groups(left, right, dims):
+        pd.testing.assert_frame_equal(left.sort_values(dims).reset_index(drop=True),
+                                      right.sort_values(dims).reset_index(drop=True), check_exact=False)
+    same_groups(analytics.extend_cube(cube, jobs, appended), analytics.build_cube(jobs), analytics.CUBE_DIMENSIONS)
+    extended = analytics.extend_key_rollups(key_rollups, jobs, appended)
+    for dims, groups in analytics.build_key_rollups(jobs).items():
+        same_groups(extended[dims], groups, list(dims))
+
+def test_malformed_lines_are_quarantined(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics, 'CACHE_DIR', str(tmp_path / 'cache'))
+    path = tmp_path / 'jobs.csv'
+    path.write_bytes(JOBS_CSV + b'''Data Scientist,Meta,"Austin, TX",170000.0,4.0,extra field
+Data Analyst,Meta,"Austin, TX",,3.0
+Data Analyst,Meta,"Austin, TX",competitive,3.0
+Data Analyst,Meta,"Austin, TX",90000.0,2.5
+''')
+    jobs = analytics.load_jobs(str(path))
+    assert len(jobs) == 4
+    assert (jobs['company_name'] == 'Google').all()
+    assert jobs.attrs['rejected_rows'] == 4
+    
+    rejected = pd.read_csv(analytics.rejected_rows_path(str(path)))
+    assert rejected['reason'].value_counts().to_dict() == {'missing or invalid salary/experience': 3,
+                                                          'wrong number of fields': 1}
+
+def test_cache_invalidated_when_csv_or_rules_change(tmp_path, monkeypatch):
+    monkeypatch.setattr(analytics, 'CACHE_DIR', str(tmp_path / 'cache'))
+    path = tmp_path / 'jobs.csv'
+    path.write_bytes(JOBS_CSV)
+    jobs, appended = analytics.refresh_jobs(str(path))
+    assert appended is None
+    jobs, appended = analytics.refresh_jobs(str(path))
+    assert len(appended) == 0
+    
+    # Same size, new mtime: the bytes are checked against the fingerprint
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    jobs, appended = analytics.refresh_jobs(str(path))
+    assert len(appended) == 0
+    
+    # A salary rewritten in place keeps the size but not the bytes
+    path.write_bytes(JOBS_CSV.replace(b'180000.0', b'190000.0'))
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    jobs, appended = analytics.refresh_jobs(str(path))
+    assert appended is None
+    assert jobs['salary'].max() == 210000 and 190000 in jobs['salary'].values
+    
+    # A dropped line is a rewrite, not an append
+    path.write_bytes(b''.join(JOBS_CSV.splitlines(keepends=True)[:-1]))
+    jobs, appended = analytics.refresh_jobs(str(path))
+    assert appended is None
+    assert len(jobs) == 3
+    
+    # New enrichment rules rebuild the cache too
+    monkeypatch.setattr(analytics, 'ENRICHMENT_VERSION', analytics.ENRICHMENT_VERSION + 1)
+    jobs, appended = analytics.refresh_jobs(str(path))
+    assert appended is None